@@ -1,17 +1,14 @@
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import os
+import tempfile
 import time
 
-from modules.facebook_analyzer import FacebookAnalyzer
-from modules.instagram_analyzer import InstagramAnalyzer
-from modules.instagram_alternative import InstagramAlternativeAnalyzer
-from modules.twitter_analyzer import TwitterAnalyzer
-from modules.reddit_analyzer import RedditAnalyzer
 from modules.sentiment_engine import SentimentEngine
+from modules.text_normalizer import TextNormalizer
+from modules.stage_profiler import StageProfiler
 
 st.set_page_config(
     page_title="Social Media Sentiment Analyzer",
@@ -36,6 +33,12 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_sentiment_engine():
+    engine = SentimentEngine()
+    engine.warm_up()
+    return engine
+
 @st.dialog("Facebook Configuration")
 def show_facebook_dialog():
     st.write("Configure your Facebook analysis settings:")
@@ -123,7 +126,7 @@ def show_reddit_dialog():
     client_id = st.text_input("Client ID")
     client_secret = st.text_input("Client Secret", type="password")
     user_agent = st.text_input("User Agent", value="SentimentAnalyzer:v1.0")
-    subreddit = st.text_input("Subreddit (without r/)")
+    subreddit = st.text_input("Subreddits (without r/, comma-separated)")
     post_limit = st.slider("Number of posts to analyze", 10, 100, 25)
     
     col1, col2 = st.columns(2)
@@ -174,7 +177,17 @@ def main():
 
     st.divider()
 
-    sentiment_engine = SentimentEngine()
+    sentiment_engine = get_sentiment_engine()
+
+    # the engine is shared by every session, so timings are kept per session
+    if st.sidebar.checkbox("Collect stage timings", key="profile_stages"):
+        st.session_state.setdefault('stage_profiler', StageProfiler())
+    else:
+        st.session_state.pop('stage_profiler', None)
+
+    st.session_state.language_handler = (
+        'skip' if st.sidebar.checkbox("Skip non-English posts", key="skip_non_english") else 'score'
+    )
 
     if "facebook_analyze" in st.session_state and st.session_state.facebook_analyze:
         handle_facebook_analysis(sentiment_engine)
@@ -189,7 +202,12 @@ def main():
         handle_reddit_analysis(sentiment_engine)
         st.session_state.reddit_analyze = False
 
+    if st.session_state.get('stage_profiler') is not None:
+        display_diagnostics(sentiment_engine, st.session_state.stage_profiler)
+
 def handle_facebook_analysis(sentiment_engine):
+    from modules.facebook_analyzer import FacebookAnalyzer
+
     st.header("Facebook Sentiment Analysis")
     
     config = st.session_state.get('facebook_config', {})
@@ -204,19 +222,12 @@ def handle_facebook_analysis(sentiment_engine):
                 posts = analyzer.get_posts(page_id, post_limit)
 
                 if posts:
-                    sentiment_data = []
-                    for post in posts:
-                        sentiment = sentiment_engine.analyze_sentiment(post['message'])
-                        sentiment_data.append({
-                            'post_id': post['id'],
-                            'message': post['message'][:100] + "...",
-                            'created_time': post['created_time'],
-                            'sentiment': sentiment['label'],
-                            'confidence': sentiment['score'],
-                            'positive': sentiment['positive'],
-                            'negative': sentiment['negative'],
-                            'neutral': sentiment['neutral']
-                        })
+                    sentiment_data = build_sentiment_frame(
+                        sentiment_engine,
+                        [post['message'] for post in posts],
+                        [post['id'] for post in posts],
+                        [post['created_time'] for post in posts]
+                    )
 
                     display_results(sentiment_data, "Facebook")
                 else:
@@ -227,6 +238,8 @@ def handle_facebook_analysis(sentiment_engine):
         st.error("Configuration missing. Please configure Facebook settings first.")
 
 def handle_instagram_analysis(sentiment_engine):
+    from modules.instagram_alternative import InstagramAlternativeAnalyzer
+
     st.header("Instagram Sentiment Analysis")
     
     config = st.session_state.get('instagram_config', {})
@@ -242,25 +255,14 @@ def handle_instagram_analysis(sentiment_engine):
                     posts = alternative_analyzer.create_sentiment_demo_posts(post_limit)
                     st.info("Using demo data with varied sentiment for analysis demonstration.")
                 else:
-                    analyzer = InstagramAnalyzer()
+                    from modules.instagram_analyzer import InstagramAnalyzer
+
+                    # a rerun after a rate limit picks up from the spooled posts and saved cursor
+                    analyzer = InstagramAnalyzer(state_dir=os.path.join(tempfile.gettempdir(), 'sentiment_instagram'))
                     posts = analyzer.get_posts(username, post_limit)
 
                 if posts:
-                    sentiment_data = []
-                    for post in posts:
-                        sentiment = sentiment_engine.analyze_sentiment(post['caption'])
-                        sentiment_data.append({
-                            'post_id': post['shortcode'],
-                            'message': post['caption'][:100] + "...",
-                            'created_time': post['date'],
-                            'sentiment': sentiment['label'],
-                            'confidence': sentiment['score'],
-                            'positive': sentiment['positive'],
-                            'negative': sentiment['negative'],
-                            'neutral': sentiment['neutral'],
-                            'likes': post['likes'],
-                            'comments': post['comments']
-                        })
+                    sentiment_data = build_instagram_frame(sentiment_engine, posts)
 
                     display_results(sentiment_data, "Instagram")
                 else:
@@ -279,21 +281,7 @@ def handle_instagram_analysis(sentiment_engine):
                                 alternative_analyzer = InstagramAlternativeAnalyzer()
                                 demo_posts = alternative_analyzer.create_sentiment_demo_posts(post_limit)
 
-                                sentiment_data = []
-                                for post in demo_posts:
-                                    sentiment = sentiment_engine.analyze_sentiment(post['caption'])
-                                    sentiment_data.append({
-                                        'post_id': post['shortcode'],
-                                        'message': post['caption'][:100] + "...",
-                                        'created_time': post['date'],
-                                        'sentiment': sentiment['label'],
-                                        'confidence': sentiment['score'],
-                                        'positive': sentiment['positive'],
-                                        'negative': sentiment['negative'],
-                                        'neutral': sentiment['neutral'],
-                                        'likes': post['likes'],
-                                        'comments': post['comments']
-                                    })
+                                sentiment_data = build_instagram_frame(sentiment_engine, demo_posts)
 
                                 st.success("Demo data loaded successfully!")
                                 display_results(sentiment_data, "Instagram (Demo)")
@@ -319,21 +307,7 @@ def handle_instagram_analysis(sentiment_engine):
                             alternative_analyzer = InstagramAlternativeAnalyzer()
                             demo_posts = alternative_analyzer.create_sentiment_demo_posts(min(post_limit, 15))
 
-                            sentiment_data = []
-                            for post in demo_posts:
-                                sentiment = sentiment_engine.analyze_sentiment(post['caption'])
-                                sentiment_data.append({
-                                    'post_id': post['shortcode'],
-                                    'message': post['caption'][:100] + "...",
-                                    'created_time': post['date'],
-                                    'sentiment': sentiment['label'],
-                                    'confidence': sentiment['score'],
-                                    'positive': sentiment['positive'],
-                                    'negative': sentiment['negative'],
-                                    'neutral': sentiment['neutral'],
-                                    'likes': post['likes'],
-                                    'comments': post['comments']
-                                })
+                            sentiment_data = build_instagram_frame(sentiment_engine, demo_posts)
 
                             st.success("Demo data loaded for analysis!")
                             display_results(sentiment_data, "Instagram (Demo)")
@@ -344,6 +318,8 @@ def handle_instagram_analysis(sentiment_engine):
         st.error("Configuration missing. Please configure Instagram settings first.")
 
 def handle_twitter_analysis(sentiment_engine):
+    from modules.twitter_analyzer import TwitterAnalyzer
+
     st.header("Twitter/X Sentiment Analysis")
     
     config = st.session_state.get('twitter_config', {})
@@ -355,24 +331,30 @@ def handle_twitter_analysis(sentiment_engine):
         with st.spinner("Fetching tweets..."):
             try:
                 analyzer = TwitterAnalyzer(bearer_token)
-                tweets = analyzer.get_tweets(search_query, tweet_limit)
+                # a pull cut short by the rate limit picks up where it stopped
+                analyzer.checkpoints = st.session_state.setdefault('twitter_checkpoints', {})
+                resume = st.session_state.get('twitter_interrupted_query') == search_query
+                tweets = analyzer.get_tweets(search_query, tweet_limit, resume=resume)
+
+                if analyzer.interrupted:
+                    st.session_state.twitter_interrupted_query = search_query
+                    st.warning(f"Twitter rate limit reached after {len(tweets)} tweets. "
+                               "Showing what was fetched; run the analysis again to continue.")
+                else:
+                    st.session_state.twitter_interrupted_query = None
 
                 if tweets:
-                    sentiment_data = []
-                    for tweet in tweets:
-                        sentiment = sentiment_engine.analyze_sentiment(tweet['text'])
-                        sentiment_data.append({
-                            'post_id': tweet['id'],
-                            'message': tweet['text'][:100] + "...",
-                            'created_time': tweet['created_at'],
-                            'sentiment': sentiment['label'],
-                            'confidence': sentiment['score'],
-                            'positive': sentiment['positive'],
-                            'negative': sentiment['negative'],
-                            'neutral': sentiment['neutral'],
-                            'retweets': tweet.get('public_metrics', {}).get('retweet_count', 0),
-                            'likes': tweet.get('public_metrics', {}).get('like_count', 0)
-                        })
+                    sentiment_data = build_sentiment_frame(
+                        sentiment_engine,
+                        [tweet['text'] for tweet in tweets],
+                        [tweet['id'] for tweet in tweets],
+                        [tweet['created_at'] for tweet in tweets],
+                        {
+                            'retweets': [tweet.get('public_metrics', {}).get('retweet_count', 0) for tweet in tweets],
+                            'likes': [tweet.get('public_metrics', {}).get('like_count', 0) for tweet in tweets]
+                        },
+                        languages=[tweet.get('lang') for tweet in tweets]
+                    )
 
                     display_results(sentiment_data, "Twitter")
                 else:
@@ -383,39 +365,62 @@ def handle_twitter_analysis(sentiment_engine):
         st.error("Configuration missing. Please configure Twitter settings first.")
 
 def handle_reddit_analysis(sentiment_engine):
+    from modules.reddit_analyzer import RedditAnalyzer
+
     st.header("Reddit Sentiment Analysis")
     
     config = st.session_state.get('reddit_config', {})
     client_id = config.get('client_id')
     client_secret = config.get('client_secret')
     user_agent = config.get('user_agent', 'SentimentAnalyzer:v1.0')
-    subreddit = config.get('subreddit')
+    subreddits = [name.strip().removeprefix('r/') for name in config.get('subreddit', '').split(',') if name.strip()]
     post_limit = config.get('post_limit', 25)
 
-    if client_id and client_secret and subreddit:
+    if client_id and client_secret and subreddits:
         with st.spinner("Fetching Reddit posts..."):
             try:
                 analyzer = RedditAnalyzer(client_id, client_secret, user_agent)
-                posts = analyzer.get_posts(subreddit, post_limit)
+                if len(subreddits) == 1:
+                    posts = [{**post, 'source': subreddits[0]} for post in analyzer.get_posts(subreddits[0], post_limit)]
+                else:
+                    posts = analyzer.get_posts_for_subreddits(subreddits, post_limit)
 
                 if posts:
-                    sentiment_data = []
-                    for post in posts:
-                        sentiment = sentiment_engine.analyze_sentiment(post['title'] + " " + post['selftext'])
-                        sentiment_data.append({
-                            'post_id': post['id'],
-                            'message': (post['title'] + " " + post['selftext'])[:100] + "...",
-                            'created_time': post['created_utc'],
-                            'sentiment': sentiment['label'],
-                            'confidence': sentiment['score'],
-                            'positive': sentiment['positive'],
-                            'negative': sentiment['negative'],
-                            'neutral': sentiment['neutral'],
-                            'score': post['score'],
-                            'comments': post['num_comments']
-                        })
+                    subreddit_language = None
+                    if analysis_options()['language_handler'] != 'score':
+                        languages = {name: analyzer.get_subreddit_info(name).get('lang') for name in subreddits}
+                        subreddit_language = [languages[post['source']] for post in posts]
+
+                    post_results = sentiment_engine.analyze_posts(
+                        [post['title'] for post in posts],
+                        [post['selftext'] for post in posts],
+                        columnar=True,
+                        languages=subreddit_language,
+                        **analysis_options()
+                    )
+                    sentiment_data = build_sentiment_frame(
+                        sentiment_engine,
+                        [post['title'] + " " + post['selftext'] for post in posts],
+                        [post['id'] for post in posts],
+                        [post['created_utc'] for post in posts],
+                        {
+                            'subreddit': [post['source'] for post in posts],
+                            'score': [post['score'] for post in posts],
+                            'comments': [post['num_comments'] for post in posts],
+                            'title_sentiment': post_results['title'].labels,
+                            'body_sentiment': post_results['body'].labels
+                        },
+                        results=post_results['post']
+                    )
 
                     display_results(sentiment_data, "Reddit")
+                    if len(subreddits) > 1:
+                        display_group_summaries(
+                            sentiment_engine.get_grouped_summary(
+                                post_results['post'], [post['source'] for post in posts]
+                            ),
+                            "Subreddit"
+                        )
                 else:
                     st.error("No posts found or unable to fetch posts.")
             except Exception as e:
@@ -423,7 +428,55 @@ def handle_reddit_analysis(sentiment_engine):
     else:
         st.error("Configuration missing. Please configure Reddit settings first.")
 
+def analysis_options():
+    # per-session settings travel with each call; the cached engine is shared by every session
+    return {
+        'profiler': st.session_state.get('stage_profiler'),
+        'language_handler': st.session_state.get('language_handler', 'score')
+    }
+
+def build_sentiment_frame(sentiment_engine, texts, post_ids, created_times, extra_columns=None, results=None,
+                          languages=None):
+    if results is None:
+        results = sentiment_engine.batch_analyze(texts, columnar=True, languages=languages, **analysis_options())
+
+    data = {
+        'post_id': post_ids,
+        'message': [text[:100] + "..." for text in texts],
+        'created_time': created_times,
+        'sentiment': results.labels,
+        'confidence': results.score,
+        'positive': results.positive,
+        'negative': results.negative,
+        'neutral': results.neutral
+    }
+    data.update(extra_columns or {})
+
+    if results.scored is None:
+        return pd.DataFrame(data, copy=False)
+
+    data['language'] = results.language
+    frame = pd.DataFrame(data, copy=False)
+    skipped = int((~results.scored).sum())
+    if skipped:
+        st.info(f"Skipped {skipped} non-English posts.")
+    return frame[results.scored].reset_index(drop=True)
+
+def build_instagram_frame(sentiment_engine, posts):
+    return build_sentiment_frame(
+        sentiment_engine,
+        [post['caption'] for post in posts],
+        [post['shortcode'] for post in posts],
+        [post['date'] for post in posts],
+        {
+            'likes': [post['likes'] for post in posts],
+            'comments': [post['comments'] for post in posts]
+        }
+    )
+
 def display_results(sentiment_data, platform):
+    import plotly.express as px
+
     df = pd.DataFrame(sentiment_data)
 
     col1, col2, col3, col4 = st.columns(4)
@@ -520,9 +573,8 @@ def display_results(sentiment_data, platform):
         st.subheader("Word Cloud")
         st.info("Word cloud visualization will be implemented here using the wordcloud library")
 
-        all_text = " ".join(df['message'].str.replace("...", ""))
-        words = all_text.split()
-        word_freq = pd.Series(words).value_counts().head(20)
+        normalized_messages = TextNormalizer.normalize_batch(df['message'].str.replace("...", ""))
+        word_freq = pd.Series(dict(TextNormalizer.word_frequencies(normalized_messages, 20)))
 
         fig_words = px.bar(
             x=word_freq.values, y=word_freq.index,
@@ -533,5 +585,42 @@ def display_results(sentiment_data, platform):
         fig_words.update_layout(height=600)
         st.plotly_chart(fig_words, use_container_width=True)
 
+def display_group_summaries(grouped, group_label):
+    st.subheader(f"Sentiment by {group_label}")
+
+    rows = []
+    for group, summary in [*grouped['groups'].items(), ('All', grouped['combined'])]:
+        if not summary.get('total_count'):
+            continue
+        rows.append({
+            group_label: group,
+            'Posts': summary['total_count'],
+            'Positive %': summary['sentiment_distribution']['positive_ratio'] * 100,
+            'Negative %': summary['sentiment_distribution']['negative_ratio'] * 100,
+            'Neutral %': summary['sentiment_distribution']['neutral_ratio'] * 100,
+            'Avg compound': summary['average_compound']
+        })
+
+    st.dataframe(pd.DataFrame(rows).round(2), use_container_width=True)
+
+def display_diagnostics(sentiment_engine, profiler):
+    with st.expander("Diagnostics", expanded=False):
+        snapshot = profiler.snapshot()
+        if not snapshot:
+            st.info("No stage timings recorded yet. Run an analysis to collect them.")
+        else:
+            stages = pd.DataFrame.from_dict(snapshot, orient='index')
+            stages.index.name = 'stage'
+            st.dataframe(stages.round(4), use_container_width=True)
+            st.bar_chart(stages['total_ms'])
+
+        cache_stats = sentiment_engine.get_cache_stats()
+        if cache_stats:
+            st.caption("Result cache")
+            st.json(cache_stats)
+
+        if st.button("Reset timings"):
+            profiler.reset()
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,48 @@
+# Usage: python -m benchmarks.compiled_vader_benchmark [--sizes 10000 100000]
+import argparse
+import random
+import time
+
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from modules.compiled_vader import CompiledVader
+from modules.instagram_alternative import InstagramAlternativeAnalyzer
+
+def build_corpus(size, seed=42):
+    random.seed(seed)
+    posts = InstagramAlternativeAnalyzer().create_sentiment_demo_posts(size)
+    fillers = ['really', 'not', 'so', 'but', 'kind of', 'VERY', 'never', '!!', '??']
+    return [
+        f"{post['caption']} {random.choice(fillers)} {random.choice(fillers)} {i}"
+        for i, post in enumerate(posts)
+    ]
+
+def run(sizes):
+    analyzer = SentimentIntensityAnalyzer()
+    compiled = CompiledVader(analyzer)
+
+    for size in sizes:
+        texts = build_corpus(size)
+
+        start = time.perf_counter()
+        stock_scores = [analyzer.polarity_scores(text) for text in texts]
+        stock_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        compiled_scores = compiled.polarity_scores_batch(texts)
+        compiled_time = time.perf_counter() - start
+
+        max_diff = max(
+            abs(stock[key] - fast[key])
+            for stock, fast in zip(stock_scores, compiled_scores)
+            for key in ('neg', 'neu', 'pos', 'compound')
+        )
+
+        print(f"{size:>8} texts | stock {stock_time:7.2f}s ({size / stock_time:9.0f}/s) | "
+              f"compiled {compiled_time:7.2f}s ({size / compiled_time:9.0f}/s) | "
+              f"speedup {stock_time / compiled_time:5.1f}x | max diff {max_diff:.4f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare stock VADER with the compiled batch scorer")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    run(parser.parse_args().sizes)
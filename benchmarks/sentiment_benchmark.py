@@ -0,0 +1,184 @@
+# Usage:
+#   python -m benchmarks.sentiment_benchmark --output baseline.json
+#   python -m benchmarks.sentiment_benchmark --compare baseline.json --threshold 0.10
+import argparse
+import json
+import platform
+import random
+import re
+import sys
+import time
+
+import numpy as np
+
+from modules.instagram_alternative import InstagramAlternativeAnalyzer
+from modules.sentiment_engine import SentimentEngine
+
+TEMPLATES = (InstagramAlternativeAnalyzer.POSITIVE_CAPTIONS
+             + InstagramAlternativeAnalyzer.NEGATIVE_CAPTIONS
+             + InstagramAlternativeAnalyzer.NEUTRAL_CAPTIONS)
+
+EMOJIS = ['😍', '😞', '⭐', '🔥', '😂', '👍', '👎', '💯', '🙄', '❤️']
+HASHTAGS = ['#mood', '#review', '#tbt', '#instagood', '#fail', '#win', '#ad', '#nofilter']
+FILLERS = ['honestly', 'really', 'not', 'so', 'kind of', 'but', 'VERY', 'never', 'lol', '!!', '??']
+
+def _sentences(template):
+    plain = re.sub(r'#\w+', '', template)
+    return [part.strip() + '.' for part in re.split(r'[.!]', plain) if part.strip()]
+
+SENTENCES = [sentence for template in TEMPLATES for sentence in _sentences(template)]
+
+def _tweet(rng, index):
+    parts = rng.sample(SENTENCES, 2) + rng.sample(FILLERS, 2)
+    rng.shuffle(parts)
+    return f"@user{index % 97} {' '.join(parts)} https://t.co/{index:x}"[:280]
+
+def _reddit(rng, index):
+    body = ' '.join(rng.choice(SENTENCES) + ' ' + rng.choice(FILLERS) for _ in range(rng.randint(15, 60)))
+    return f"Post {index}: {rng.choice(SENTENCES)} {body}"
+
+def _caption(rng, index):
+    extras = rng.sample(EMOJIS, 3) + rng.sample(HASHTAGS, 4)
+    return f"{rng.choice(TEMPLATES)} {' '.join(extras)} #{index}"
+
+PROFILES = {
+    'tweet': _tweet,
+    'reddit': _reddit,
+    'caption': _caption
+}
+
+def build_corpus(profile, size, seed=42):
+    rng = random.Random(f"{profile}:{size}:{seed}")
+    generator = PROFILES[profile]
+    return [generator(rng, index) for index in range(size)]
+
+# below this many timed calls p99 is little more than the maximum, so it is not gated
+MIN_GATED_SAMPLES = 100
+
+def _latency_stats(call_seconds, total_seconds, count, unit):
+    # percentiles are over individual timed calls: one text, one batch or one summary
+    latencies = np.asarray(call_seconds) * 1000
+    return {
+        'texts_per_sec': count / total_seconds if total_seconds else 0.0,
+        'latency_unit': unit,
+        'samples': len(latencies),
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p99_ms': float(np.percentile(latencies, 99))
+    }
+
+def bench_analyze_sentiment(engine, texts):
+    latencies = []
+    start = time.perf_counter()
+    for text in texts:
+        call_start = time.perf_counter()
+        engine.analyze_sentiment(text)
+        latencies.append(time.perf_counter() - call_start)
+    return _latency_stats(latencies, time.perf_counter() - start, len(texts), 'text')
+
+def bench_batch_analyze(engine, texts, batch_size, min_samples=MIN_GATED_SAMPLES):
+    batches = [texts[offset:offset + batch_size] for offset in range(0, len(texts), batch_size)]
+    # small corpora are replayed so the batch percentiles rest on enough calls
+    rounds = -(-min_samples // len(batches))
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for batch in batches:
+            call_start = time.perf_counter()
+            engine.batch_analyze(batch)
+            latencies.append(time.perf_counter() - call_start)
+    return _latency_stats(latencies, time.perf_counter() - start, len(texts) * rounds, 'batch')
+
+def bench_summary(engine, sentiments, repeats=MIN_GATED_SAMPLES):
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeats):
+        call_start = time.perf_counter()
+        engine.get_sentiment_summary(sentiments)
+        latencies.append(time.perf_counter() - call_start)
+    return _latency_stats(latencies, time.perf_counter() - start, len(sentiments) * repeats, 'summary')
+
+def run(sizes, profiles, seed, batch_size, engine_options):
+    engine = SentimentEngine(cache_size=0, **engine_options)
+    engine.warm_up(background=False)
+
+    results = {}
+    for profile in profiles:
+        for size in sizes:
+            texts = build_corpus(profile, size, seed)
+            sentiments = engine.batch_analyze(texts, parallel=False)
+
+            results[f"analyze_sentiment/{profile}/{size}"] = bench_analyze_sentiment(engine, texts)
+            results[f"batch_analyze/{profile}/{size}"] = bench_batch_analyze(engine, texts, batch_size)
+            results[f"get_sentiment_summary/{profile}/{size}"] = bench_summary(engine, sentiments)
+
+    engine.close()
+    return {
+        'meta': {
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'seed': seed,
+            'batch_size': batch_size,
+            'engine': engine_options
+        },
+        'results': results
+    }
+
+def compare(current, baseline, threshold):
+    regressions = []
+    for name, stats in current['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None:
+            continue
+
+        throughput_change = stats['texts_per_sec'] / reference['texts_per_sec'] - 1 if reference['texts_per_sec'] else 0.0
+
+        # p99 is only comparable per the same unit and only meaningful with enough calls behind it
+        gate_p99 = (
+            reference.get('latency_unit') == stats['latency_unit'] and reference['p99_ms']
+            and min(stats['samples'], reference.get('samples', 0)) >= MIN_GATED_SAMPLES
+        )
+        p99_change = stats['p99_ms'] / reference['p99_ms'] - 1 if gate_p99 else 0.0
+
+        flagged = throughput_change < -threshold or p99_change > threshold
+        if flagged:
+            regressions.append(name)
+        p99_text = f"p99/{stats['latency_unit']} {p99_change:+7.1%}" if gate_p99 else "p99 not gated"
+        print(f"{'REGRESSION' if flagged else 'ok':<10} {name:<40} "
+              f"throughput {throughput_change:+7.1%}  {p99_text}")
+    return regressions
+
+def report(current):
+    for name, stats in current['results'].items():
+        unit = stats['latency_unit']
+        print(f"{name:<40} {stats['texts_per_sec']:>12.0f} texts/s  "
+              f"p50/{unit} {stats['p50_ms']:8.3f} ms  p99/{unit} {stats['p99_ms']:8.3f} ms  "
+              f"({stats['samples']} calls)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmarks for SentimentEngine")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--profiles', nargs='+', choices=sorted(PROFILES), default=sorted(PROFILES))
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--mode', choices=['full', 'cascade'], default='full')
+    parser.add_argument('--vader-backend', choices=['stock', 'compiled'], default='stock')
+    parser.add_argument('--output', help="write results to this JSON baseline file")
+    parser.add_argument('--compare', help="compare against a JSON baseline and flag regressions")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="relative throughput drop or p99 increase that counts as a regression")
+    args = parser.parse_args()
+
+    current = run(args.sizes, args.profiles, args.seed, args.batch_size,
+                  {'mode': args.mode, 'vader_backend': args.vader_backend})
+    report(current)
+
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(current, handle, indent=2)
+
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)
+        if compare(current, baseline, args.threshold):
+            sys.exit(1)
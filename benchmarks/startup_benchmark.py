@@ -0,0 +1,75 @@
+# Usage: python -m benchmarks.startup_benchmark [--runs 5] [--reruns 20]
+import argparse
+import functools
+import statistics
+import subprocess
+import sys
+import time
+
+EAGER_IMPORTS = """
+import pandas, numpy
+import plotly.express, plotly.graph_objects
+import modules.facebook_analyzer, modules.instagram_analyzer, modules.instagram_alternative
+import modules.twitter_analyzer, modules.reddit_analyzer, modules.sentiment_engine
+"""
+
+LAZY_IMPORTS = """
+import pandas, numpy
+import modules.sentiment_engine
+"""
+
+FIRST_SCORE = """
+from modules.sentiment_engine import SentimentEngine
+engine = SentimentEngine(cache_size=0)
+if {warm}:
+    engine.warm_up().join()
+start = time.perf_counter()
+engine.analyze_sentiment("Amazing day! Love this new product!")
+"""
+
+def time_in_subprocess(snippet, runs):
+    code = f"import time\nstart = time.perf_counter()\n{snippet}\nprint(time.perf_counter() - start)"
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        samples.append(float(output.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+def time_reruns(reruns):
+    from modules.sentiment_engine import SentimentEngine
+
+    start = time.perf_counter()
+    for _ in range(reruns):
+        SentimentEngine()
+    per_rerun_before = (time.perf_counter() - start) / reruns
+
+    @functools.lru_cache(maxsize=None)
+    def shared_engine():
+        return SentimentEngine()
+
+    shared_engine()
+    start = time.perf_counter()
+    for _ in range(reruns):
+        shared_engine()
+    per_rerun_after = (time.perf_counter() - start) / reruns
+
+    return per_rerun_before, per_rerun_after
+
+def run(runs, reruns):
+    eager = time_in_subprocess(EAGER_IMPORTS, runs)
+    lazy = time_in_subprocess(LAZY_IMPORTS, runs)
+    print(f"cold-start imports   | before {eager * 1000:8.1f} ms | after {lazy * 1000:8.1f} ms")
+
+    cold_first = time_in_subprocess(FIRST_SCORE.format(warm=False), runs)
+    warm_first = time_in_subprocess(FIRST_SCORE.format(warm=True), runs)
+    print(f"first score          | before {cold_first * 1000:8.1f} ms | after {warm_first * 1000:8.1f} ms")
+
+    before, after = time_reruns(reruns)
+    print(f"engine per rerun     | before {before * 1000:8.1f} ms | after {after * 1000:8.4f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure app cold-start and per-rerun engine cost")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--reruns', type=int, default=20)
+    args = parser.parse_args()
+    run(args.runs, args.reruns)
@@ -0,0 +1 @@
+# keeps the repo root on sys.path so tests import modules.* under a plain `pytest` run
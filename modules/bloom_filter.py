@@ -0,0 +1,58 @@
+import hashlib
+import math
+
+class BloomFilter:
+    def __init__(self, capacity=50000, error_rate=0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(str(item).encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def __len__(self):
+        return self.count
+
+class RotatingBloomFilter:
+    def __init__(self, capacity=50000, error_rate=0.001):
+        # two generations of `capacity` items each: memory stays fixed and the
+        # most recent capacity..2*capacity items are always remembered
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.current = BloomFilter(capacity, error_rate)
+        self.previous = None
+        self.rotations = 0
+
+    def add(self, item):
+        if self.current.count >= self.capacity:
+            self.previous = self.current
+            self.current = BloomFilter(self.capacity, self.error_rate)
+            self.rotations += 1
+        self.current.add(item)
+
+    def __contains__(self, item):
+        return item in self.current or (self.previous is not None and item in self.previous)
+
+    def add_if_new(self, item):
+        if item in self:
+            return False
+        self.add(item)
+        return True
+
+    @property
+    def memory_bytes(self):
+        return len(self.current._bits) * (2 if self.previous is not None else 1)
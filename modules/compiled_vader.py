@@ -0,0 +1,277 @@
+from vaderSentiment import vaderSentiment as vader
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+import numpy as np
+import re
+import string
+
+N_SCALAR = vader.N_SCALAR
+C_INCR = vader.C_INCR
+SPECIAL_CASES = getattr(vader, 'SPECIAL_CASES', getattr(vader, 'SPECIAL_CASE_IDIOMS', {}))
+
+CONTROL_WORDS = ['no', 'or', 'nor', 'kind', 'of', 'least', 'at', 'very',
+                 'never', 'so', 'this', 'without', 'doubt', 'but']
+
+class CompiledVader:
+    def __init__(self, analyzer=None):
+        self.analyzer = analyzer or SentimentIntensityAnalyzer()
+        self._build_tables()
+        self._build_emoji_pattern()
+
+    def _build_tables(self):
+        lexicon = self.analyzer.lexicon
+        idiom_keys = [key for key in list(SPECIAL_CASES) + list(vader.BOOSTER_DICT) if ' ' in key]
+
+        words = set(lexicon) | set(vader.BOOSTER_DICT) | set(vader.NEGATE) | set(CONTROL_WORDS)
+        for key in idiom_keys:
+            words.update(key.split(' '))
+
+        # id 0 is reserved for tokens outside the vocabulary
+        self.vocab = {word: index for index, word in enumerate(sorted(words), start=1)}
+        size = len(self.vocab) + 1
+
+        self.valence = np.zeros(size, dtype=np.float64)
+        self.in_lexicon = np.zeros(size, dtype=bool)
+        self.booster = np.zeros(size, dtype=np.float64)
+        self.is_booster = np.zeros(size, dtype=bool)
+        self.is_negation = np.zeros(size, dtype=bool)
+
+        for word, index in self.vocab.items():
+            if word in lexicon:
+                self.valence[index] = lexicon[word]
+                self.in_lexicon[index] = True
+            if word in vader.BOOSTER_DICT:
+                self.booster[index] = vader.BOOSTER_DICT[word]
+                self.is_booster[index] = True
+            if word in vader.NEGATE or "n't" in word:
+                self.is_negation[index] = True
+
+        self.word_ids = {word: self.vocab[word] for word in CONTROL_WORDS}
+
+        pairs = set()
+        for key in idiom_keys:
+            first, second = key.split(' ')[:2]
+            pairs.add(self.vocab[first] * size + self.vocab[second])
+        self.idiom_pairs = np.array(sorted(pairs), dtype=np.int64)
+        self._vocab_size = size
+
+    def _build_emoji_pattern(self):
+        # a small class plus a dict check is far cheaper than a class of every emoji
+        ascii_emojis = [key for key in self.analyzer.emojis if len(key) == 1 and key.isascii()]
+        self._emoji_pattern = re.compile('[^\x00-\x7f' + ''.join(re.escape(e) for e in ascii_emojis) + ']')
+        self._has_ascii_emojis = bool(ascii_emojis)
+
+    def _replace_emoji(self, match):
+        start = match.start()
+        description = self.analyzer.emojis.get(match.group(0))
+        if description is None:
+            return match.group(0)
+        if start == 0 or match.string[start - 1] == ' ':
+            return description
+        return ' ' + description
+
+    def _prepare_text(self, text):
+        if self._has_ascii_emojis or not text.isascii():
+            text = self._emoji_pattern.sub(self._replace_emoji, text)
+        return text.strip()
+
+    def tokenize(self, texts):
+        vocab_get = self.vocab.get
+        punctuation = string.punctuation
+
+        ids = []
+        upper = []
+        offsets = [0]
+        exclamations = []
+        questions = []
+        prepared = []
+
+        for text in texts:
+            text = self._prepare_text(text)
+            prepared.append(text)
+            exclamations.append(text.count('!'))
+            questions.append(text.count('?'))
+
+            for token in text.split():
+                stripped = token.strip(punctuation)
+                if len(stripped) > 2:
+                    token = stripped
+                lower = token.lower()
+                token_id = vocab_get(lower, 0)
+                if token_id == 0 and "n't" in lower:
+                    token_id = -1
+                ids.append(token_id)
+                upper.append(token.isupper())
+            offsets.append(len(ids))
+
+        return {
+            'ids': np.array(ids, dtype=np.int64),
+            'upper': np.array(upper, dtype=bool),
+            'offsets': np.array(offsets, dtype=np.int64),
+            'exclamations': np.array(exclamations, dtype=np.int64),
+            'questions': np.array(questions, dtype=np.int64),
+            'texts': prepared
+        }
+
+    def score_arrays(self, texts):
+        texts = list(texts)
+        n_docs = len(texts)
+        tokens = self.tokenize(texts)
+
+        raw_ids = tokens['ids']
+        upper = tokens['upper']
+        offsets = tokens['offsets']
+        lengths = np.diff(offsets)
+        n_tokens = len(raw_ids)
+
+        # tokens outside the vocabulary that still negate (e.g. "shouldn't've")
+        nt_negation = raw_ids == -1
+        ids = np.where(nt_negation, 0, raw_ids)
+
+        doc = np.repeat(np.arange(n_docs), lengths)
+        pos = np.arange(n_tokens) - offsets[:-1][doc]
+        doc_length = lengths[doc]
+
+        def prev(values, k, fill=False):
+            shifted = np.full(n_tokens, fill, dtype=values.dtype)
+            if n_tokens > k:
+                shifted[k:] = values[:-k]
+            return np.where(pos >= k, shifted, fill)
+
+        def following(values, k=1, fill=False):
+            shifted = np.full(n_tokens, fill, dtype=values.dtype)
+            if n_tokens > k:
+                shifted[:-k] = values[k:]
+            return np.where(pos < doc_length - k, shifted, fill)
+
+        def word(name):
+            return ids == self.word_ids[name]
+
+        in_lexicon = self.in_lexicon[ids]
+        base_valence = self.valence[ids]
+        booster = self.booster[ids]
+        is_booster = self.is_booster[ids]
+        negation = self.is_negation[ids] | nt_negation
+        is_no = word('no')
+        is_so_this = word('so') | word('this')
+        is_never = word('never')
+        is_without = word('without')
+        is_doubt = word('doubt')
+
+        upper_counts = np.bincount(doc, weights=upper.astype(np.float64), minlength=n_docs)
+        cap_differential = (lengths - upper_counts > 0) & (upper_counts > 0)
+        caps = upper & cap_differential[doc]
+
+        active = in_lexicon & ~is_booster & ~(word('kind') & following(word('of')))
+
+        valence = base_valence.copy()
+        valence[is_no & following(in_lexicon)] = 0.0
+        no_before = prev(is_no, 1) | prev(is_no, 2) | (prev(is_no, 3) & prev(word('or') | word('nor'), 1))
+        valence = np.where(no_before, base_valence * N_SCALAR, valence)
+        valence = np.where(caps, np.where(valence > 0, valence + C_INCR, valence - C_INCR), valence)
+
+        for k, damping in ((1, 1.0), (2, 0.95), (3, 0.9)):
+            applies = (pos >= k) & ~prev(in_lexicon, k)
+
+            scalar = prev(booster, k, 0.0)
+            scalar = np.where(valence < 0, -scalar, scalar)
+            boosted_caps = prev(is_booster, k) & prev(caps, k)
+            scalar = np.where(boosted_caps, np.where(valence > 0, scalar + C_INCR, scalar - C_INCR), scalar)
+            if damping != 1.0:
+                scalar = scalar * damping
+            valence = np.where(applies, valence + scalar, valence)
+
+            if k == 1:
+                factor = np.where(prev(negation, 1), N_SCALAR, 1.0)
+            elif k == 2:
+                never_so = prev(is_never, 2) & prev(is_so_this, 1)
+                without_doubt = prev(is_without, 2) & prev(is_doubt, 1)
+                factor = np.where(never_so, 1.25,
+                                  np.where(without_doubt, 1.0, np.where(prev(negation, 2), N_SCALAR, 1.0)))
+            else:
+                # mirrors VADER's operator precedence: a preceding "so"/"this" alone triggers the boost
+                never_so = (prev(is_never, 3) & prev(is_so_this, 2)) | prev(is_so_this, 1)
+                without_doubt = prev(is_without, 3) & (prev(is_doubt, 2) | prev(is_doubt, 1))
+                factor = np.where(never_so, 1.25,
+                                  np.where(without_doubt, 1.0, np.where(prev(negation, 3), N_SCALAR, 1.0)))
+            valence = np.where(applies, valence * factor, valence)
+
+        least = prev(word('least'), 1) & ~prev(in_lexicon, 1) & ~(prev(word('at'), 2) | prev(word('very'), 2))
+        valence = np.where(least, valence * N_SCALAR, valence)
+
+        sentiments = np.where(active, valence, 0.0)
+
+        self._apply_but_check(sentiments, ids, doc, offsets)
+
+        sum_s = np.bincount(doc, weights=sentiments, minlength=n_docs)
+        pos_sum = np.bincount(doc, weights=np.where(sentiments > 0, sentiments + 1, 0.0), minlength=n_docs)
+        neg_sum = np.bincount(doc, weights=np.where(sentiments < 0, sentiments - 1, 0.0), minlength=n_docs)
+        neu_count = np.bincount(doc, weights=(sentiments == 0).astype(np.float64), minlength=n_docs)
+
+        exclamation_amp = np.minimum(tokens['exclamations'], 4) * 0.292
+        qm = tokens['questions']
+        question_amp = np.where(qm > 3, 0.96, np.where(qm > 1, qm * 0.18, 0.0))
+        punct_amp = exclamation_amp + question_amp
+
+        sum_s = np.where(sum_s > 0, sum_s + punct_amp, np.where(sum_s < 0, sum_s - punct_amp, sum_s))
+        compound = np.clip(sum_s / np.sqrt(sum_s * sum_s + 15), -1.0, 1.0)
+
+        abs_neg = np.abs(neg_sum)
+        more_positive = pos_sum > abs_neg
+        more_negative = pos_sum < abs_neg
+        pos_sum = np.where(more_positive, pos_sum + punct_amp, pos_sum)
+        neg_sum = np.where(more_negative, neg_sum - punct_amp, neg_sum)
+
+        total = pos_sum + np.abs(neg_sum) + neu_count
+        has_tokens = lengths > 0
+        safe_total = np.where(has_tokens, total, 1.0)
+
+        scores = {
+            'neg': np.where(has_tokens, np.round(np.abs(neg_sum / safe_total), 3), 0.0),
+            'neu': np.where(has_tokens, np.round(np.abs(neu_count / safe_total), 3), 0.0),
+            'pos': np.where(has_tokens, np.round(np.abs(pos_sum / safe_total), 3), 0.0),
+            'compound': np.where(has_tokens, np.round(compound, 4), 0.0)
+        }
+
+        self._apply_fallback(scores, texts, ids, doc)
+        return scores
+
+    def _apply_but_check(self, sentiments, ids, doc, offsets):
+        is_but = ids == self.word_ids['but']
+        if not is_but.any():
+            return
+
+        for d in np.unique(doc[is_but]):
+            start, end = offsets[d], offsets[d + 1]
+            but_index = int(np.argmax(is_but[start:end]))
+            values = sentiments[start:end].tolist()
+            # replays VADER's list.index() lookup so repeated valences match exactly
+            for value in list(values):
+                index = values.index(value)
+                if index < but_index:
+                    values[index] = value * 0.5
+                elif index > but_index:
+                    values[index] = value * 1.5
+            sentiments[start:end] = values
+
+    def _apply_fallback(self, scores, texts, ids, doc):
+        if len(ids) < 2 or len(self.idiom_pairs) == 0:
+            return
+
+        same_doc = doc[:-1] == doc[1:]
+        pair_codes = ids[:-1] * self._vocab_size + ids[1:]
+        hits = same_doc & np.isin(pair_codes, self.idiom_pairs)
+
+        for d in np.unique(doc[:-1][hits]):
+            result = self.analyzer.polarity_scores(texts[d])
+            for key in ('neg', 'neu', 'pos', 'compound'):
+                scores[key][d] = result[key]
+
+    def polarity_scores_batch(self, texts):
+        scores = self.score_arrays(texts)
+        return [
+            {'neg': float(neg), 'neu': float(neu), 'pos': float(pos), 'compound': float(compound)}
+            for neg, neu, pos, compound in zip(scores['neg'], scores['neu'], scores['pos'], scores['compound'])
+        ]
+
+    def polarity_scores(self, text):
+        return self.polarity_scores_batch([text])[0]
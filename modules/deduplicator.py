@@ -0,0 +1,123 @@
+import zlib
+
+import numpy as np
+
+from modules.text_normalizer import TextNormalizer
+
+_PRIME = np.uint64((1 << 31) - 1)
+
+class TextDeduplicator:
+    def __init__(self, num_perm=64, bands=16, shingle_size=3, threshold=0.8, near_duplicates=True, seed=1):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        self.near_duplicates = near_duplicates
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(_PRIME), size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, int(_PRIME), size=num_perm).astype(np.uint64)
+
+        self.stats = {
+            'total': 0,
+            'exact_duplicates': 0,
+            'near_duplicates': 0,
+            'clusters': 0
+        }
+
+    @staticmethod
+    def _normalize(text):
+        # the exact key keeps case: VADER scores ALL-CAPS emphasis differently,
+        # so only texts the engine would clean to the same string are merged here
+        return TextNormalizer.normalize(text or "")
+
+    def _shingles(self, normalized):
+        # case is kept here too, or near-duplicate matching would merge what the exact key keeps apart
+        words = normalized.split()
+        if len(words) <= self.shingle_size:
+            return [normalized]
+        return list({' '.join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)})
+
+    def signature(self, normalized):
+        shingles = self._shingles(normalized)
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+            dtype=np.uint64, count=len(shingles)
+        ) % _PRIME
+        return ((np.outer(self._a, hashes) + self._b[:, None]) % _PRIME).min(axis=1)
+
+    def cluster(self, texts):
+        texts = list(texts)
+
+        exact = {}
+        unique_index = []
+        unique_texts = []
+        for text in texts:
+            normalized = self._normalize(text)
+            slot = exact.get(normalized)
+            if slot is None:
+                slot = len(unique_texts)
+                exact[normalized] = slot
+                unique_texts.append(normalized)
+            unique_index.append(slot)
+
+        parent = list(range(len(unique_texts)))
+
+        def find(node):
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        near_merges = 0
+        if self.near_duplicates and len(unique_texts) > 1:
+            candidates = [i for i, normalized in enumerate(unique_texts) if normalized]
+            signatures = np.array([self.signature(unique_texts[i]) for i in candidates])
+
+            for band in range(self.bands):
+                columns = signatures[:, band * self.rows:(band + 1) * self.rows]
+                buckets = {}
+                for row, key in enumerate(map(bytes, columns)):
+                    heads = buckets.setdefault(key, [])
+                    for head in heads:
+                        if np.mean(signatures[row] == signatures[head]) >= self.threshold:
+                            root_a, root_b = find(candidates[row]), find(candidates[head])
+                            if root_a != root_b:
+                                parent[max(root_a, root_b)] = min(root_a, root_b)
+                                near_merges += 1
+                            break
+                    else:
+                        heads.append(row)
+
+        cluster_of_root = {}
+        cluster_ids = []
+        representatives = []
+        for index, slot in enumerate(unique_index):
+            root = find(slot)
+            cluster_id = cluster_of_root.get(root)
+            if cluster_id is None:
+                cluster_id = len(representatives)
+                cluster_of_root[root] = cluster_id
+                representatives.append(index)
+            cluster_ids.append(cluster_id)
+
+        self.stats['total'] += len(texts)
+        self.stats['exact_duplicates'] += len(texts) - len(unique_texts)
+        self.stats['near_duplicates'] += near_merges
+        self.stats['clusters'] += len(representatives)
+
+        return cluster_ids, representatives
+
+    def get_stats(self):
+        total = self.stats['total']
+        saved = total - self.stats['clusters']
+        return {
+            **self.stats,
+            'scored': self.stats['clusters'],
+            'saved': saved,
+            'saved_ratio': saved / total if total else 0.0
+        }
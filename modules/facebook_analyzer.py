@@ -1,96 +1,178 @@
 import requests
+import asyncio
 import json
 from datetime import datetime
+from urllib.parse import urlencode
 import time
 
+from modules.graph_transport import GraphTransport, AsyncGraphTransport
+
 class FacebookAnalyzer:
     
-    def __init__(self, access_token):
+    POST_FIELDS = 'id,message,created_time,likes.summary(true),comments.summary(true),shares'
+    COMMENT_FIELDS = 'id,message,created_time,from,like_count'
+    PAGE_SIZE = 100
+    
+    def __init__(self, access_token, timeout=10, max_concurrency=8):
         self.access_token = access_token
         self.base_url = "https://graph.facebook.com/v18.0"
+        self.max_concurrency = max_concurrency
+        self.transport = GraphTransport(self.base_url, access_token, timeout=timeout, pool_size=max_concurrency)
+        self._async_transport = None
     
-    def get_posts(self, page_id, limit=20):
+    def get_posts(self, page_id, limit=20, comment_limit=0):
+        return list(self.iter_posts(page_id, limit, comment_limit))
+    
+    def iter_posts(self, page_id, limit=20, comment_limit=0):
         try:
-            url = f"{self.base_url}/{page_id}/posts"
-            params = {
-                'access_token': self.access_token,
-                'fields': 'id,message,created_time,likes.summary(true),comments.summary(true),shares',
-                'limit': limit
-            }
-            
-            response = requests.get(url, params=params)
-            response.raise_for_status()
+            path = f"{page_id}/posts"
+            params = {'fields': self._post_fields(comment_limit), 'limit': min(limit, self.PAGE_SIZE)}
+            yielded = 0
             
-            data = response.json()
-            posts = []
-            
-            for post in data.get('data', []):
-                if 'message' not in post:
-                    continue
+            while path and yielded < limit:
+                data = self.transport.get(path, params)
                 
-                post_data = {
-                    'id': post['id'],
-                    'message': post['message'],
-                    'created_time': self._parse_facebook_time(post['created_time']),
-                    'likes': post.get('likes', {}).get('summary', {}).get('total_count', 0),
-                    'comments': post.get('comments', {}).get('summary', {}).get('total_count', 0),
-                    'shares': post.get('shares', {}).get('count', 0)
-                }
-                posts.append(post_data)
-            
-            return posts
-            
+                for post in data.get('data', []):
+                    if 'message' not in post:
+                        continue
+                    
+                    parsed = self._parse_post(post)
+                    if comment_limit:
+                        parsed['comment_items'] = self._parse_comments(post.get('comments', {}))
+                    yield parsed
+                    
+                    yielded += 1
+                    if yielded >= limit:
+                        return
+                
+                if not data.get('data'):
+                    return
+                
+                # the next link already carries the cursor, fields and token
+                path = data.get('paging', {}).get('next')
+                params = None
+        
         except requests.exceptions.RequestException as e:
             raise Exception(f"Facebook API error: {str(e)}")
         except Exception as e:
             raise Exception(f"Error processing Facebook data: {str(e)}")
     
+    def _post_fields(self, comment_limit=0):
+        fields = self.POST_FIELDS.split(',')
+        if comment_limit:
+            # nested expansion returns each post's top comments in the same response,
+            # so it takes the place of the plain comment summary
+            fields[fields.index('comments.summary(true)')] = (
+                f"comments.limit({comment_limit}).summary(true){{{self.COMMENT_FIELDS}}}"
+            )
+        return ','.join(fields)
+    
     def get_page_info(self, page_id):
         try:
-            url = f"{self.base_url}/{page_id}"
-            params = {
-                'access_token': self.access_token,
-                'fields': 'id,name,category,fan_count,talking_about_count'
-            }
-            
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            
-            return response.json()
-            
+            return self.transport.get(page_id, {'fields': 'id,name,category,fan_count,talking_about_count'})
+        
         except requests.exceptions.RequestException as e:
             raise Exception(f"Facebook API error: {str(e)}")
     
     def get_post_comments(self, post_id, limit=10):
         try:
-            url = f"{self.base_url}/{post_id}/comments"
-            params = {
-                'access_token': self.access_token,
-                'fields': 'id,message,created_time,from,like_count',
-                'limit': limit
-            }
-            
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            comments = []
-            
-            for comment in data.get('data', []):
-                if 'message' in comment:
-                    comment_data = {
-                        'id': comment['id'],
-                        'message': comment['message'],
-                        'created_time': self._parse_facebook_time(comment['created_time']),
-                        'author': comment.get('from', {}).get('name', 'Unknown'),
-                        'likes': comment.get('like_count', 0)
-                    }
-                    comments.append(comment_data)
-            
-            return comments
+            data = self.transport.get(f"{post_id}/comments", {'fields': self.COMMENT_FIELDS, 'limit': limit})
+            return self._parse_comments(data)
+        
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Facebook API error: {str(e)}")
+    
+    def get_comments_batch(self, post_ids, limit=10):
+        post_ids = list(post_ids)
+        query = urlencode({'fields': self.COMMENT_FIELDS, 'limit': limit})
+        try:
+            responses = self.transport.batch([f"{post_id}/comments?{query}" for post_id in post_ids])
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Facebook API error: {str(e)}")
+        
+        comments = {}
+        for post_id, (code, body) in zip(post_ids, responses):
+            if code != 200:
+                message = (body or {}).get('error', {}).get('message', 'no response')
+                raise Exception(f"Facebook API error for post {post_id}: {message}")
+            comments[post_id] = self._parse_comments(body)
+        return comments
+    
+    def get_posts_for_pages(self, page_ids, limit=20):
+        return asyncio.run(self.fetch_posts_for_pages(page_ids, limit))
+    
+    def get_comments_for_posts(self, post_ids, limit=10):
+        return asyncio.run(self.fetch_comments_for_posts(post_ids, limit))
+    
+    async def fetch_posts_for_pages(self, page_ids, limit=20):
+        page_ids = list(page_ids)
+        try:
+            posts = await asyncio.gather(*(self._fetch_page_posts(page_id, limit) for page_id in page_ids))
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Facebook API error: {str(e)}")
+        
+        return dict(zip(page_ids, posts))
+    
+    async def _fetch_page_posts(self, page_id, limit):
+        transport = self._get_async_transport()
+        path = f"{page_id}/posts"
+        params = {'fields': self.POST_FIELDS, 'limit': min(limit, self.PAGE_SIZE)}
+        posts = []
+        
+        # pages of different page ids interleave, but every request still goes through the capped executor
+        while path and len(posts) < limit:
+            data = await transport.get(path, params)
+            posts.extend(self._parse_post(post) for post in data.get('data', []) if 'message' in post)
             
+            if not data.get('data'):
+                break
+            path = data.get('paging', {}).get('next')
+            params = None
+        
+        return posts[:limit]
+    
+    async def fetch_comments_for_posts(self, post_ids, limit=10):
+        post_ids = list(post_ids)
+        params = {'fields': self.COMMENT_FIELDS, 'limit': limit}
+        try:
+            responses = await self._get_async_transport().get_many(
+                (f"{post_id}/comments", params) for post_id in post_ids
+            )
         except requests.exceptions.RequestException as e:
             raise Exception(f"Facebook API error: {str(e)}")
+        
+        return {post_id: self._parse_comments(data) for post_id, data in zip(post_ids, responses)}
+    
+    def _get_async_transport(self):
+        if self._async_transport is None:
+            self._async_transport = AsyncGraphTransport(self.transport, self.max_concurrency)
+        return self._async_transport
+    
+    def _parse_post(self, post):
+        return {
+            'id': post['id'],
+            'message': post['message'],
+            'created_time': self._parse_facebook_time(post['created_time']),
+            'likes': post.get('likes', {}).get('summary', {}).get('total_count', 0),
+            'comments': post.get('comments', {}).get('summary', {}).get('total_count', 0),
+            'shares': post.get('shares', {}).get('count', 0)
+        }
+    
+    def _parse_comments(self, data):
+        comments = []
+        
+        for comment in data.get('data', []):
+            if 'message' in comment:
+                comment_data = {
+                    'id': comment['id'],
+                    'message': comment['message'],
+                    'created_time': self._parse_facebook_time(comment['created_time']),
+                    'author': comment.get('from', {}).get('name', 'Unknown'),
+                    'likes': comment.get('like_count', 0)
+                }
+                comments.append(comment_data)
+        
+        return comments
     
     def _parse_facebook_time(self, time_string):
         try:
@@ -103,14 +185,17 @@ class FacebookAnalyzer:
     
     def validate_token(self):
         try:
-            url = f"{self.base_url}/me"
-            params = {'access_token': self.access_token}
-            
-            response = requests.get(url, params=params)
+            response = self.transport.request('me')
             return response.status_code == 200
-            
+        
         except:
             return False
+    
+    def close(self):
+        if self._async_transport is not None:
+            self._async_transport.close()
+            self._async_transport = None
+        self.transport.close()
 
     @staticmethod
     def get_setup_instructions():
@@ -0,0 +1,78 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+class GraphTransport:
+    BATCH_LIMIT = 50
+
+    def __init__(self, base_url, access_token, timeout=10, pool_size=10):
+        self.base_url = base_url.rstrip('/')
+        self.access_token = access_token
+        self.timeout = timeout
+        self.request_count = 0
+
+        # one keep-alive pool per host, shared by every call this transport makes
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _url(self, path):
+        if path.startswith(('http://', 'https://')):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(self, path, params=None, method='GET', data=None):
+        params = dict(params or {})
+        # paging links already carry the token in their query string
+        if not path.startswith(('http://', 'https://')):
+            params.setdefault('access_token', self.access_token)
+
+        self.request_count += 1
+        return self.session.request(method, self._url(path), params=params, data=data, timeout=self.timeout)
+
+    def get(self, path, params=None):
+        response = self.request(path, params)
+        response.raise_for_status()
+        return response.json()
+
+    def batch(self, relative_urls):
+        # each Graph batch call carries up to 50 GET requests in one round trip
+        results = []
+        for offset in range(0, len(relative_urls), self.BATCH_LIMIT):
+            chunk = relative_urls[offset:offset + self.BATCH_LIMIT]
+            payload = json.dumps([{'method': 'GET', 'relative_url': url} for url in chunk])
+            response = self.request('', method='POST', data={'batch': payload, 'include_headers': 'false'})
+            response.raise_for_status()
+
+            for item in response.json():
+                if item is None:
+                    results.append((None, None))
+                    continue
+                body = item.get('body')
+                results.append((item.get('code'), json.loads(body) if body else None))
+        return results
+
+    def close(self):
+        self.session.close()
+
+class AsyncGraphTransport:
+
+    def __init__(self, transport, max_concurrency=8):
+        self.transport = transport
+        self.max_concurrency = max_concurrency
+        # the worker count is the concurrency limit; calls beyond it queue
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='graph')
+
+    async def get(self, path, params=None):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.transport.get, path, params)
+
+    async def get_many(self, calls):
+        return await asyncio.gather(*(self.get(path, params) for path, params in calls))
+
+    def close(self):
+        self._executor.shutdown(wait=False)
@@ -5,6 +5,30 @@ import random
 from datetime import datetime
 
 class InstagramAlternativeAnalyzer:
+    POSITIVE_CAPTIONS = [
+        "Amazing day! Love this new product! 😍 #happy #love #awesome",
+        "Best experience ever! Highly recommend! ⭐⭐⭐⭐⭐ #great #recommend",
+        "Fantastic quality! Super satisfied with my purchase! #quality #satisfied",
+        "Incredible service! Will definitely come back! #service #excellent",
+        "Perfect! Everything exceeded my expectations! #perfect #exceeded"
+    ]
+    
+    NEGATIVE_CAPTIONS = [
+        "Terrible experience. Very disappointed. 😞 #disappointed #bad",
+        "Poor quality for the price. Not worth it. #poor #expensive",
+        "Worst customer service ever! Avoid this! #worst #avoid",
+        "Complete waste of money. Don't buy this. #waste #money",
+        "Horrible product. Broke after one day. #horrible #broken"
+    ]
+    
+    NEUTRAL_CAPTIONS = [
+        "Regular product. Nothing special but okay. #okay #regular",
+        "Standard quality. What you'd expect. #standard #expected",
+        "It's fine. Does what it's supposed to do. #fine #functional",
+        "Average experience. Could be better. #average #could_be_better",
+        "Normal product. No complaints, no praise. #normal #standard"
+    ]
+    
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({
@@ -61,31 +85,7 @@ class InstagramAlternativeAnalyzer:
             }
     
     def create_sentiment_demo_posts(self, count=15):
-        positive_captions = [
-            "Amazing day! Love this new product! 😍 #happy #love #awesome",
-            "Best experience ever! Highly recommend! ⭐⭐⭐⭐⭐ #great #recommend",
-            "Fantastic quality! Super satisfied with my purchase! #quality #satisfied",
-            "Incredible service! Will definitely come back! #service #excellent",
-            "Perfect! Everything exceeded my expectations! #perfect #exceeded"
-        ]
-        
-        negative_captions = [
-            "Terrible experience. Very disappointed. 😞 #disappointed #bad",
-            "Poor quality for the price. Not worth it. #poor #expensive",
-            "Worst customer service ever! Avoid this! #worst #avoid",
-            "Complete waste of money. Don't buy this. #waste #money",
-            "Horrible product. Broke after one day. #horrible #broken"
-        ]
-        
-        neutral_captions = [
-            "Regular product. Nothing special but okay. #okay #regular",
-            "Standard quality. What you'd expect. #standard #expected",
-            "It's fine. Does what it's supposed to do. #fine #functional",
-            "Average experience. Could be better. #average #could_be_better",
-            "Normal product. No complaints, no praise. #normal #standard"
-        ]
-        
-        all_captions = positive_captions + negative_captions + neutral_captions
+        all_captions = self.POSITIVE_CAPTIONS + self.NEGATIVE_CAPTIONS + self.NEUTRAL_CAPTIONS
         posts = []
         
         for i in range(count):
@@ -1,14 +1,45 @@
 import instaloader
 from datetime import datetime
+import json
+import os
 import time
-import random
+
+from modules.rate_limiter import AdaptiveRateLimiter
+
+class AdaptiveRateController(instaloader.RateController):
+    def __init__(self, context, limiter):
+        super().__init__(context)
+        self.limiter = limiter
+    
+    def wait_before_query(self, query_type):
+        # instaloader asks once per page of results, so pacing here is per page, not per item
+        self.limiter.acquire()
+    
+    def handle_429(self, query_type):
+        # instaloader retries the query right after this returns, so the backoff is waited out here
+        self.limiter.record_throttle()
+        self.limiter.acquire()
 
 class InstagramAnalyzer:
     
-    def __init__(self):
-        self.loader = instaloader.Instaloader()        
+    def __init__(self, rate_limiter=None, state_dir=None, resume_max_age=3600):
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self.state_dir = state_dir
+        self.resume_max_age = resume_max_age
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+        # instaloader's own per-request random sleep is replaced by the adaptive limiter
+        self.loader = instaloader.Instaloader(
+            sleep=False,
+            rate_controller=lambda context: AdaptiveRateController(context, self.rate_limiter)
+        )
         self.loader.context.log = lambda *args, **kwargs: None        
         self.loader.context.user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        self._prepare_session()
+        self._observe_queries()
+    
+    def _prepare_session(self):
+        # loading or creating a login replaces the session, so this runs again afterwards
         self.loader.context._session.headers.update({
             'Accept-Language': 'en-US,en;q=0.9',
             'Accept-Encoding': 'gzip, deflate, br',
@@ -16,24 +47,84 @@ class InstagramAnalyzer:
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         })
+    
+    def _observe_queries(self):
+        # page queries run on copies of the session that drop response hooks, so
+        # outcomes are recorded around get_json, which every JSON query goes through
+        context = self.loader.context
+        get_json = context.get_json
         
-    def get_posts(self, username, limit=20):
-        try:            
-            time.sleep(random.uniform(2, 5))
-                        
+        def observed_get_json(*args, **kwargs):
+            # retries re-enter through here with _attempt > 1; only the outer call counts
+            outer = kwargs.get('_attempt', 1) == 1
+            try:
+                result = get_json(*args, **kwargs)
+            except instaloader.exceptions.ConnectionException as e:
+                # 429s are recorded by the rate controller; 401 "please wait a few minutes" is not
+                if outer and '401' in str(e):
+                    self.rate_limiter.record_throttle()
+                raise
+            if outer:
+                self.rate_limiter.record_success()
+            return result
+        
+        context.get_json = observed_get_json
+    
+    def get_posts(self, username, limit=20, resume=True):
+        return list(self.iter_posts(username, limit, resume))
+    
+    def get_rate_stats(self):
+        return self.rate_limiter.get_stats()
+    
+    @staticmethod
+    def _is_throttled(error):
+        message = str(error).lower()
+        return "rate limit" in message or "429" in message or "401" in message
+    
+    def iter_posts(self, username, limit=20, resume=True):
+        spool_path = self._state_path(f"posts-{username}.jsonl")
+        checkpoint_path = self._state_path(f"resume-{username}.json")
+        if not resume:
+            self._clear_progress(spool_path, checkpoint_path)
+        frozen, exhausted, spooled = self._load_progress(spool_path, checkpoint_path)
+        
+        # posts collected by an earlier, interrupted pull are served from the spool first
+        seen = set()
+        post_count = 0
+        for post_data in spooled:
+            if post_count >= limit:
+                break
+            seen.add(post_data['shortcode'])
+            yield post_data
+            post_count += 1
+        if exhausted or post_count >= limit:
+            self._clear_progress(spool_path, checkpoint_path)
+            return
+        
+        posts = None
+        interrupted = False
+        spool = open(spool_path, 'a', encoding='utf-8') if spool_path else None
+        try:
             profile = instaloader.Profile.from_username(self.loader.context, username)
             
-            posts = []
-            post_count = 0
             max_retries = 3
             retry_count = 0
             
             while post_count < limit and retry_count < max_retries:
+                posts = profile.get_posts()
+                if frozen is not None:
+                    try:
+                        # continue from the stored cursor instead of paging from the top again
+                        posts.thaw(frozen)
+                    except instaloader.exceptions.InvalidArgumentException:
+                        frozen = None
+                
                 try:
-                    for post in profile.get_posts():
-                        if post_count >= limit:
-                            break
-                                                
+                    for post in posts:
+                        # a thawed iterator repeats the item it was frozen on
+                        if post.shortcode in seen:
+                            continue
+                        
                         try:
                             post_data = {
                                 'shortcode': post.shortcode,
@@ -47,40 +138,99 @@ class InstagramAnalyzer:
                                 'mentions': list(post.caption_mentions) if post.caption else []
                             }
                             
-                            posts.append(post_data)
-                            post_count += 1
-                                                        
-                            time.sleep(random.uniform(1, 3))
-                            
                         except Exception as post_error:
                             print(f"Warning: Skipping post due to error: {post_error}")
                             continue
-                            
+                        
+                        seen.add(post_data['shortcode'])
+                        if spool is not None:
+                            spool.write(json.dumps({**post_data, 'date': post_data['date'].isoformat()}) + "\n")
+                            spool.flush()
+                        
+                        yield post_data
+                        post_count += 1
+                        if post_count >= limit:
+                            break
+                    else:
+                        exhausted = True
+                    
                     break
                     
                 except Exception as e:
+                    frozen = posts.freeze()
                     retry_count += 1
-                    if "rate limit" in str(e).lower() or "429" in str(e) or "401" in str(e):
-                        wait_time = random.uniform(60, 120) * retry_count
+                    if self._is_throttled(e):
+                        wait_time = self.rate_limiter.get_stats()['blocked_for']
                         print(f"Rate limit detected. Waiting {wait_time:.0f} seconds before retry {retry_count}/{max_retries}")
-                        time.sleep(wait_time)
+                        self.rate_limiter.acquire()
                     else:
                         raise e
             
-            if not posts and retry_count >= max_retries:
+            if not post_count and retry_count >= max_retries:
                 raise Exception("Unable to fetch posts after multiple retries. Instagram may have rate limited the requests.")
-            
-            return posts
+            # retries used up on throttling before the limit was reached
+            interrupted = post_count < limit and not exhausted
             
         except instaloader.exceptions.ProfileNotExistsException:
             raise Exception(f"Instagram profile '{username}' does not exist")
         except instaloader.exceptions.PrivateProfileNotFollowedException:
             raise Exception(f"Instagram profile '{username}' is private")
         except Exception as e:
-            if "rate limit" in str(e).lower() or "401" in str(e) or "429" in str(e):
+            interrupted = True
+            if self._is_throttled(e):
                 raise Exception(f"Instagram rate limit exceeded. Please wait 10-15 minutes before trying again. Original error: {str(e)}")
             else:
                 raise Exception(f"Error fetching Instagram posts: {str(e)}")
+        finally:
+            if spool is not None:
+                spool.close()
+            # only a failed or throttled pull leaves a checkpoint for the next call to resume from
+            if not interrupted:
+                self._clear_progress(spool_path, checkpoint_path)
+            elif checkpoint_path and posts is not None:
+                self._save_progress(checkpoint_path, posts.freeze(), exhausted)
+    
+    def _state_path(self, name):
+        if not self.state_dir:
+            return None
+        return os.path.join(self.state_dir, name)
+    
+    def _load_progress(self, spool_path, checkpoint_path):
+        if not checkpoint_path or not os.path.exists(checkpoint_path):
+            return None, False, []
+        
+        try:
+            with open(checkpoint_path, encoding='utf-8') as f:
+                checkpoint = json.load(f)
+            frozen = instaloader.FrozenNodeIterator(**checkpoint['iterator'])
+            
+            spooled = []
+            if os.path.exists(spool_path):
+                with open(spool_path, encoding='utf-8') as f:
+                    for line in f:
+                        post_data = json.loads(line)
+                        post_data['date'] = datetime.fromisoformat(post_data['date'])
+                        spooled.append(post_data)
+        except (OSError, ValueError, KeyError, TypeError):
+            self._clear_progress(spool_path, checkpoint_path)
+            return None, False, []
+        
+        # an old checkpoint would serve stale posts; past that the pull starts over
+        age = time.time() - checkpoint.get('saved_at', 0)
+        if age > self.resume_max_age or not frozen.best_before or frozen.best_before < time.time():
+            self._clear_progress(spool_path, checkpoint_path)
+            return None, False, []
+        
+        return frozen, checkpoint.get('exhausted', False), spooled
+    
+    def _save_progress(self, checkpoint_path, frozen, exhausted):
+        with open(checkpoint_path, 'w', encoding='utf-8') as f:
+            json.dump({'iterator': frozen._asdict(), 'exhausted': exhausted, 'saved_at': time.time()}, f)
+    
+    def _clear_progress(self, spool_path, checkpoint_path):
+        for path in (spool_path, checkpoint_path):
+            if path and os.path.exists(path):
+                os.remove(path)
     
     def get_profile_info(self, username):
         try:
@@ -122,8 +272,6 @@ class InstagramAnalyzer:
                 
                 comments.append(comment_data)
                 comment_count += 1
-                                
-                time.sleep(0.5)
             
             return comments
             
@@ -131,10 +279,12 @@ class InstagramAnalyzer:
             raise Exception(f"Error fetching comments: {str(e)}")
     
     def search_hashtag(self, hashtag, limit=20):
+        return list(self.iter_hashtag_posts(hashtag, limit))
+    
+    def iter_hashtag_posts(self, hashtag, limit=20):
         try:
             hashtag_obj = instaloader.Hashtag.from_name(self.loader.context, hashtag)
             
-            posts = []
             post_count = 0
             
             for post in hashtag_obj.get_posts():
@@ -152,19 +302,30 @@ class InstagramAnalyzer:
                     'hashtags': list(post.caption_hashtags) if post.caption else []
                 }
                 
-                posts.append(post_data)
+                yield post_data
                 post_count += 1
-                
-                time.sleep(2)
-            
-            return posts
             
         except Exception as e:
             raise Exception(f"Error searching hashtag: {str(e)}")
     
-    def login(self, username, password):
+    def login(self, username, password, session_file=None):
+        session_file = session_file or self._state_path(f"session-{username}")
+        try:
+            # a saved session skips the login round trip and the checkpoint challenges it can trigger
+            self.loader.load_session_from_file(username, session_file)
+            self._prepare_session()
+            if self.loader.test_login() == username:
+                return True
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            if self._is_throttled(e):
+                raise Exception(f"Login failed: {str(e)}")
+        
         try:
             self.loader.login(username, password)
+            self._prepare_session()
+            self.loader.save_session_to_file(session_file)
             return True
         except Exception as e:
             raise Exception(f"Login failed: {str(e)}")
@@ -0,0 +1,137 @@
+import math
+import re
+from collections import Counter
+
+from modules.text_normalizer import TextNormalizer
+
+class LanguageDetector:
+    UNDETERMINED = 'und'
+    # platform markers for undetermined, media-only, hashtag-only and similar posts
+    UNDETERMINED_CODES = {'und', 'unknown', 'zxx', 'qme', 'qam', 'qct', 'qht', 'qst', 'art'}
+
+    # characters in these ranges settle the language (or family) on their own
+    SCRIPTS = (
+        ('ru', re.compile(r'[Ѐ-ӿ]')),
+        ('el', re.compile(r'[Ͱ-Ͽ]')),
+        ('ar', re.compile(r'[؀-ۿ]')),
+        ('he', re.compile(r'[֐-׿]')),
+        ('hi', re.compile(r'[ऀ-ॿ]')),
+        ('th', re.compile(r'[฀-๿]')),
+        ('ko', re.compile(r'[가-힯ᄀ-ᇿ]')),
+        ('ja', re.compile(r'[぀-ヿ]')),
+        ('zh', re.compile(r'[一-鿿]'))
+    )
+
+    SAMPLES = {
+        'en': "All human beings are born free and equal in dignity and rights. They are endowed with reason and "
+              "conscience and should act towards one another in a spirit of brotherhood. I think this is the best "
+              "thing that has happened to me this year, and I do not know what you would have done without it. "
+              "We were going to the store when it started to rain, so we stayed at home with our friends. "
+              "Honestly this is so good, love it! What a terrible day, I hate waiting for the train. "
+              "Incredible service and perfect quality, everything exceeded my expectations. Very disappointed, the "
+              "worst customer experience ever, a complete waste of money. Would definitely recommend this product.",
+        'es': "Todos los seres humanos nacen libres e iguales en dignidad y derechos y, dotados como están de razón "
+              "y conciencia, deben comportarse fraternalmente los unos con los otros. Creo que esto es lo mejor que "
+              "me ha pasado este año, y no sé qué habrías hecho sin eso. Íbamos a la tienda cuando empezó a llover, "
+              "así que nos quedamos en casa con nuestros amigos. Me encanta, es muy bueno. Qué día tan horrible. "
+              "Servicio increíble y calidad perfecta, todo superó mis expectativas. Muy decepcionado, la peor "
+              "experiencia de cliente, una pérdida total de dinero. Recomiendo este producto.",
+        'fr': "Tous les êtres humains naissent libres et égaux en dignité et en droits. Ils sont doués de raison et "
+              "de conscience et doivent agir les uns envers les autres dans un esprit de fraternité. Je pense que "
+              "c'est la meilleure chose qui me soit arrivée cette année, et je ne sais pas ce que tu aurais fait "
+              "sans cela. Nous allions au magasin quand il a commencé à pleuvoir, alors nous sommes restés à la "
+              "maison avec nos amis. J'adore, c'est vraiment bien. Quelle journée horrible. "
+              "Service incroyable et qualité parfaite, tout a dépassé mes attentes. Très déçu, la pire expérience "
+              "client, une perte totale d'argent. Je recommande ce produit.",
+        'de': "Alle Menschen sind frei und gleich an Würde und Rechten geboren. Sie sind mit Vernunft und Gewissen "
+              "begabt und sollen einander im Geist der Brüderlichkeit begegnen. Ich glaube, das ist das Beste, was "
+              "mir in diesem Jahr passiert ist, und ich weiß nicht, was du ohne das gemacht hättest. Wir waren auf "
+              "dem Weg zum Laden, als es anfing zu regnen, also blieben wir mit unseren Freunden zu Hause. "
+              "Das ist wirklich super, ich liebe es. Was für ein schrecklicher Tag. "
+              "Unglaublicher Service und perfekte Qualität, alles hat meine Erwartungen übertroffen. Sehr "
+              "enttäuscht, der schlechteste Kundendienst, eine komplette Geldverschwendung. Ich empfehle dieses Produkt.",
+        'pt': "Todos os seres humanos nascem livres e iguais em dignidade e em direitos. Dotados de razão e de "
+              "consciência, devem agir uns para com os outros em espírito de fraternidade. Acho que esta é a melhor "
+              "coisa que me aconteceu este ano, e não sei o que você teria feito sem isso. Estávamos indo para a "
+              "loja quando começou a chover, então ficamos em casa com os nossos amigos. Adorei, é muito bom. "
+              "Que dia horrível. Serviço incrível e qualidade perfeita, tudo superou as minhas expectativas. "
+              "Muito decepcionado, a pior experiência de cliente, um desperdício total de dinheiro. Recomendo este produto.",
+        'it': "Tutti gli esseri umani nascono liberi ed eguali in dignità e diritti. Essi sono dotati di ragione e "
+              "di coscienza e devono agire gli uni verso gli altri in spirito di fratellanza. Penso che questa sia "
+              "la cosa migliore che mi sia successa quest'anno, e non so cosa avresti fatto senza. Stavamo andando "
+              "al negozio quando ha cominciato a piovere, così siamo rimasti a casa con i nostri amici. "
+              "Lo adoro, è davvero bello. Che giornata orribile. "
+              "Servizio incredibile e qualità perfetta, tutto ha superato le mie aspettative. Molto deluso, la "
+              "peggiore esperienza cliente, uno spreco totale di soldi. Consiglio questo prodotto.",
+        'nl': "Alle mensen worden vrij en gelijk in waardigheid en rechten geboren. Zij zijn begiftigd met verstand "
+              "en geweten, en behoren zich jegens elkander in een geest van broederschap te gedragen. Ik denk dat "
+              "dit het beste is wat mij dit jaar is overkomen, en ik weet niet wat jij zonder dit had gedaan. We "
+              "waren op weg naar de winkel toen het begon te regenen, dus bleven we thuis met onze vrienden. "
+              "Ik vind het geweldig, echt goed. Wat een vreselijke dag. "
+              "Ongelooflijke service en perfecte kwaliteit, alles overtrof mijn verwachtingen. Erg teleurgesteld, "
+              "de slechtste klantenservice ooit, een totale verspilling van geld. Ik raad dit product aan."
+    }
+
+    _NON_LETTER = re.compile(r"[^\w']+|[\d_]+")
+
+    def __init__(self, min_letters=12, min_similarity=0.05, default_language='en', default_margin=1.4,
+                 max_chars=400):
+        self.min_letters = min_letters
+        self.min_similarity = min_similarity
+        self.default_language = default_language
+        self.default_margin = default_margin
+        self.max_chars = max_chars
+        self.profiles = {language: self._profile(sample) for language, sample in self.SAMPLES.items()}
+
+    @classmethod
+    def _trigrams(cls, text):
+        padded = ' ' + ' '.join(cls._NON_LETTER.sub(' ', text.lower()).split()) + ' '
+        return Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+
+    @classmethod
+    def _profile(cls, text):
+        counts = cls._trigrams(text)
+        norm = math.sqrt(sum(count * count for count in counts.values()))
+        return {trigram: count / norm for trigram, count in counts.items()}
+
+    def detect(self, text):
+        # the opening few hundred characters are plenty to tell languages apart
+        text = TextNormalizer.normalize((text or "")[:self.max_chars])
+        letters = sum(1 for char in text if char.isalpha())
+        if letters == 0:
+            return self.UNDETERMINED
+
+        for language, pattern in self.SCRIPTS:
+            if len(pattern.findall(text)) * 2 > letters:
+                return language
+
+        if letters < self.min_letters:
+            return self.UNDETERMINED
+
+        counts = self._trigrams(text)
+        norm = math.sqrt(sum(count * count for count in counts.values()))
+        similarities = {
+            language: sum(count * profile.get(trigram, 0.0) for trigram, count in counts.items()) / norm
+            for language, profile in self.profiles.items()
+        }
+
+        best_language = max(similarities, key=similarities.get)
+        if similarities[best_language] < self.min_similarity:
+            return self.UNDETERMINED
+
+        # the profiles are small, so another language has to clearly beat
+        # the default before a text is routed away from it
+        default_similarity = similarities.get(self.default_language, 0.0)
+        if best_language != self.default_language and similarities[best_language] < default_similarity * self.default_margin:
+            return self.default_language
+        return best_language
+
+    def detect_batch(self, texts):
+        return [self.detect(text) for text in texts]
+
+    @staticmethod
+    def normalize_code(code):
+        if not code:
+            return None
+        # platform codes like 'en-GB' or 'pt_BR' route on the primary subtag
+        return re.split(r'[-_]', str(code).strip().lower())[0] or None
@@ -0,0 +1,178 @@
+import re
+import threading
+import time
+
+class RateLimitDeferred(Exception):
+    def __init__(self, endpoint, retry_at):
+        super().__init__(f"Rate limit for {endpoint} resets at {time.strftime('%H:%M:%S', time.localtime(retry_at))}")
+        self.endpoint = endpoint
+        self.retry_at = retry_at
+
+class TokenBucket:
+    def __init__(self, rate, capacity, clock=time.time):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.clock = clock
+        self.updated = clock()
+        self.blocked_until = 0.0
+
+    def _refill(self, now):
+        if self.blocked_until and now >= self.blocked_until:
+            # the server restores the full window once the reset time passes
+            self.tokens = float(self.capacity)
+            self.blocked_until = 0.0
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, tokens=1, max_wait=None):
+        now = self.clock()
+        self._refill(now)
+
+        wait = max(self.blocked_until - now, 0.0)
+        if self.tokens < tokens:
+            wait = max(wait, (tokens - self.tokens) / self.rate)
+        if max_wait is not None and wait > max_wait:
+            return wait, False
+
+        # a reservation may drive the balance negative; later callers queue behind it
+        self.tokens -= tokens
+        return wait, True
+
+class RateLimitScheduler:
+    def __init__(self, default_limit=450, window=900, max_wait=60.0, burst=None, sleep=time.sleep, clock=time.time):
+        self.default_limit = default_limit
+        self.window = window
+        self.burst = burst
+        self.max_wait = max_wait
+        self.sleep = sleep
+        self.clock = clock
+        self.buckets = {}
+        self.stats = {'requests': 0, 'waits': 0, 'waited_seconds': 0.0, 'deferred': 0, 'rate_limited': 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def endpoint_key(route):
+        # /2/users/123/tweets and /2/users/456/tweets share one limit
+        return re.sub(r'/\d{4,}(?=/|$)', '/:id', route)
+
+    def _bucket(self, endpoint):
+        bucket = self.buckets.get(endpoint)
+        if bucket is None:
+            if self.burst is not None and self.burst < self.default_limit:
+                # burst up front plus the rest refilled over the window: no window can exceed the limit
+                bucket = TokenBucket((self.default_limit - self.burst) / self.window, self.burst, self.clock)
+            else:
+                bucket = TokenBucket(self.default_limit / self.window, self.default_limit, self.clock)
+            self.buckets[endpoint] = bucket
+        return bucket
+
+    def acquire(self, route):
+        endpoint = self.endpoint_key(route)
+        with self._lock:
+            wait, granted = self._bucket(endpoint).reserve(max_wait=self.max_wait)
+            if not granted:
+                self.stats['deferred'] += 1
+                raise RateLimitDeferred(endpoint, self.clock() + wait)
+            self.stats['requests'] += 1
+            if wait > 0:
+                self.stats['waits'] += 1
+                self.stats['waited_seconds'] += wait
+
+        if wait > 0:
+            self.sleep(wait)
+
+    def observe(self, route, headers, rate_limited=False):
+        limit = headers.get('x-rate-limit-limit')
+        remaining = headers.get('x-rate-limit-remaining')
+        reset = headers.get('x-rate-limit-reset')
+        if limit is None or remaining is None or reset is None:
+            return
+
+        endpoint = self.endpoint_key(route)
+        with self._lock:
+            bucket = self._bucket(endpoint)
+            bucket.capacity = int(limit)
+            bucket.rate = int(limit) / self.window
+            bucket.tokens = min(bucket.tokens, float(remaining))
+            if rate_limited:
+                self.stats['rate_limited'] += 1
+            if int(remaining) <= 0 or rate_limited:
+                bucket.tokens = 0.0
+                bucket.blocked_until = float(reset)
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                **self.stats,
+                'endpoints': {
+                    endpoint: {
+                        'tokens': bucket.tokens,
+                        'capacity': bucket.capacity,
+                        'blocked_until': bucket.blocked_until or None
+                    }
+                    for endpoint, bucket in self.buckets.items()
+                }
+            }
+
+class AdaptiveRateLimiter:
+    def __init__(self, initial_rate=0.5, min_rate=0.05, max_rate=1.0, increase=0.05, burst=2,
+                 base_backoff=30.0, max_backoff=900.0, sleep=time.sleep, clock=time.time):
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.sleep = sleep
+        self.clock = clock
+        self.bucket = TokenBucket(initial_rate, burst, clock)
+        self.throttle_streak = 0
+        self.stats = {'requests': 0, 'successes': 0, 'throttled': 0, 'waits': 0, 'waited_seconds': 0.0,
+                      'last_wait': 0.0, 'backoff_seconds': 0.0}
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self):
+        return self.bucket.rate
+
+    def acquire(self):
+        with self._lock:
+            wait, _ = self.bucket.reserve()
+            self.stats['requests'] += 1
+            self.stats['last_wait'] = wait
+            if wait > 0:
+                self.stats['waits'] += 1
+                self.stats['waited_seconds'] += wait
+
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+    def record_success(self):
+        # additive increase while responses stay healthy
+        with self._lock:
+            self.stats['successes'] += 1
+            self.throttle_streak = 0
+            self.bucket.rate = min(self.max_rate, self.bucket.rate + self.increase)
+
+    def record_throttle(self):
+        # multiplicative decrease plus an exponentially growing pause on each consecutive 429/401
+        with self._lock:
+            self.stats['throttled'] += 1
+            self.throttle_streak += 1
+            self.bucket.rate = max(self.min_rate, self.bucket.rate / 2)
+            backoff = min(self.max_backoff, self.base_backoff * 2 ** (self.throttle_streak - 1))
+            self.bucket.tokens = 0.0
+            self.bucket.blocked_until = max(self.bucket.blocked_until, self.clock() + backoff)
+            self.stats['backoff_seconds'] += backoff
+            return backoff
+
+    def get_stats(self):
+        with self._lock:
+            blocked_until = self.bucket.blocked_until
+            return {
+                **self.stats,
+                'rate_per_second': self.bucket.rate,
+                'throttle_streak': self.throttle_streak,
+                'blocked_for': max(blocked_until - self.clock(), 0.0) if blocked_until else 0.0
+            }
@@ -1,97 +1,318 @@
 import praw
+import prawcore
+from praw.models import MoreComments
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+import threading
 import time
 
+from modules.rate_limiter import RateLimitScheduler
+
+class CountingRequestor(prawcore.Requestor):
+    def __init__(self, *args, on_request=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_request = on_request
+    
+    def request(self, *args, **kwargs):
+        if self.on_request is not None:
+            self.on_request()
+        return super().request(*args, **kwargs)
+
 class RedditAnalyzer:    
-    def __init__(self, client_id, client_secret, user_agent):
+    INFO_BATCH_SIZE = 100
+    MULTIREDDIT_SIZE = 50
+    
+    def __init__(self, client_id, client_secret, user_agent, requests_per_minute=60, max_concurrency=4):
+        self.api_calls = Counter()
+        self.max_concurrency = max_concurrency
+        # one client-wide budget shared by every thread; callers wait for a slot. The burst
+        # covers one request per worker and keeps any 60 seconds within requests_per_minute
+        self.rate_limiter = RateLimitScheduler(default_limit=requests_per_minute, window=60, max_wait=None,
+                                               burst=min(max_concurrency, requests_per_minute))
+        self._thread_calls = threading.local()
+        self._calls_lock = threading.Lock()
+        self._client_options = {
+            'client_id': client_id,
+            'client_secret': client_secret,
+            'user_agent': user_agent,
+            'requestor_class': CountingRequestor,
+            'requestor_kwargs': {'on_request': self._on_request}
+        }
+        # PRAW is not thread-safe: fan-out workers borrow clients of their own,
+        # all built on the same requestor hook and so the same rate limiter
+        self._worker_clients = threading.local()
+        self._idle_clients = []
+        self._clients_lock = threading.Lock()
         try:
-            self.reddit = praw.Reddit(
-                client_id=client_id,
-                client_secret=client_secret,
-                user_agent=user_agent
-            )            
-            self.reddit.user.me()
+            self._reddit = praw.Reddit(**self._client_options)
+            self._reddit.user.me()
         except Exception as e:
-            self.reddit = praw.Reddit(
-                client_id=client_id,
-                client_secret=client_secret,
-                user_agent=user_agent
-            )
+            self._reddit = praw.Reddit(**self._client_options)
+    
+    @property
+    def reddit(self):
+        client = getattr(self._worker_clients, 'reddit', None)
+        return client if client is not None else self._reddit
+    
+    @contextmanager
+    def _worker_client(self):
+        # idle clients are reused so a fan-out does not re-authenticate every worker
+        with self._clients_lock:
+            client = self._idle_clients.pop() if self._idle_clients else None
+        if client is None:
+            client = praw.Reddit(**self._client_options)
+        
+        self._worker_clients.reddit = client
+        try:
+            yield client
+        finally:
+            self._worker_clients.reddit = None
+            with self._clients_lock:
+                self._idle_clients.append(client)
+    
+    def _in_worker(self, func):
+        def run(*args):
+            with self._worker_client():
+                return func(*args)
+        return run
+    
+    def _on_request(self):
+        self.rate_limiter.acquire('reddit')
+        self._thread_calls.count = self._request_count() + 1
+    
+    def _request_count(self):
+        # counted per thread so concurrent fan-out calls are attributed to the right method
+        return getattr(self._thread_calls, 'count', 0)
+    
+    def _flush_calls(self, method, since):
+        count = self._request_count()
+        with self._calls_lock:
+            self.api_calls[method] += count - since
+        return count
+    
+    @contextmanager
+    def _count_calls(self, method):
+        before = self._request_count()
+        try:
+            yield
+        finally:
+            self._flush_calls(method, before)
+    
+    def get_api_call_stats(self):
+        with self._calls_lock:
+            return {
+                'total': sum(self.api_calls.values()),
+                'by_method': dict(self.api_calls),
+                'rate_limit': self.rate_limiter.get_stats()
+            }
+    
+    @staticmethod
+    def _post_dict(post):
+        # read only what the listing already delivered: attribute access on an
+        # unfetched PRAW object would issue a request for a missing field
+        data = vars(post)
+        author = data.get('author')
+        subreddit = data.get('subreddit')
+        return {
+            'id': data.get('id'),
+            'title': data.get('title', ''),
+            'selftext': data.get('selftext', ''),
+            'author': str(author) if author else '[deleted]',
+            'created_utc': datetime.fromtimestamp(data.get('created_utc', 0)),
+            'score': data.get('score', 0),
+            'upvote_ratio': data.get('upvote_ratio'),
+            'num_comments': data.get('num_comments', 0),
+            'url': data.get('url'),
+            'permalink': f"https://reddit.com{data.get('permalink', '')}",
+            'subreddit': str(subreddit) if subreddit else None,
+            'is_self': data.get('is_self'),
+            'link_flair_text': data.get('link_flair_text'),
+            'over_18': data.get('over_18', False)
+        }
+    
+    @staticmethod
+    def _comment_dict(comment):
+        data = vars(comment)
+        author = data.get('author')
+        subreddit = data.get('subreddit')
+        return {
+            'id': data.get('id'),
+            'body': data.get('body', ''),
+            'author': str(author) if author else '[deleted]',
+            'created_utc': datetime.fromtimestamp(data.get('created_utc', 0)),
+            'score': data.get('score', 0),
+            'parent_id': data.get('parent_id'),
+            'depth': data.get('depth', 0),
+            'subreddit': str(subreddit) if subreddit else None
+        }
+    
+    def hydrate_posts(self, post_ids):
+        return list(self.iter_hydrated_posts(post_ids))
+    
+    def iter_hydrated_posts(self, post_ids):
+        fullnames = [post_id if post_id.startswith('t3_') else f"t3_{post_id}" for post_id in post_ids]
+        try:
+            with self._count_calls('hydrate_posts'):
+                # reddit.info asks for up to 100 fullnames per request
+                for post in self.reddit.info(fullnames=fullnames):
+                    yield self._post_dict(post)
+        
+        except Exception as e:
+            raise Exception(f"Error hydrating Reddit posts: {str(e)}")
+    
+    def refresh_scores(self, post_ids):
+        return {
+            post['id']: {
+                'score': post['score'],
+                'upvote_ratio': post['upvote_ratio'],
+                'num_comments': post['num_comments']
+            }
+            for post in self.iter_hydrated_posts(post_ids)
+        }
     
     def get_posts(self, subreddit_name, limit=25, sort_type='hot'):
+        return list(self.iter_posts(subreddit_name, limit, sort_type))
+    
+    def iter_posts(self, subreddit_name, limit=25, sort_type='hot'):
         try:
-            subreddit = self.reddit.subreddit(subreddit_name)
-                        
-            if sort_type == 'hot':
-                posts_iterator = subreddit.hot(limit=limit)
-            elif sort_type == 'new':
-                posts_iterator = subreddit.new(limit=limit)
-            elif sort_type == 'top':
-                posts_iterator = subreddit.top(limit=limit, time_filter='week')
-            elif sort_type == 'rising':
-                posts_iterator = subreddit.rising(limit=limit)
-            else:
-                posts_iterator = subreddit.hot(limit=limit)
-            
-            posts = []
-            for post in posts_iterator:                
-                if post.stickied or post.is_self is None:
-                    continue
+            with self._count_calls('get_posts'):
+                subreddit = self.reddit.subreddit(subreddit_name)
+                            
+                if sort_type == 'hot':
+                    posts_iterator = subreddit.hot(limit=limit)
+                elif sort_type == 'new':
+                    posts_iterator = subreddit.new(limit=limit)
+                elif sort_type == 'top':
+                    posts_iterator = subreddit.top(limit=limit, time_filter='week')
+                elif sort_type == 'rising':
+                    posts_iterator = subreddit.rising(limit=limit)
+                else:
+                    posts_iterator = subreddit.hot(limit=limit)
                 
-                post_data = {
-                    'id': post.id,
-                    'title': post.title,
-                    'selftext': post.selftext,
-                    'author': str(post.author) if post.author else '[deleted]',
-                    'created_utc': datetime.fromtimestamp(post.created_utc),
-                    'score': post.score,
-                    'upvote_ratio': post.upvote_ratio,
-                    'num_comments': post.num_comments,
-                    'url': post.url,
-                    'permalink': f"https://reddit.com{post.permalink}",
-                    'subreddit': post.subreddit.display_name,
-                    'is_self': post.is_self,
-                    'link_flair_text': post.link_flair_text,
-                    'over_18': post.over_18
-                }
-                posts.append(post_data)
-            
-            return posts
+                for post in posts_iterator:                
+                    data = vars(post)
+                    if data.get('stickied') or data.get('is_self') is None:
+                        continue
+                    
+                    yield self._post_dict(post)
             
         except Exception as e:
             raise Exception(f"Error fetching Reddit posts: {str(e)}")
     
-    def get_post_comments(self, post_id, limit=20):
+    def get_posts_for_subreddits(self, subreddit_names, limit=25, sort_type='hot', use_multireddit=True,
+                                 max_concurrency=None):
+        names = list(dict.fromkeys(subreddit_names))
+        posts = {name.lower(): [] for name in names}
+        
         try:
-            submission = self.reddit.submission(id=post_id)
-            submission.comments.replace_more(limit=0)
+            if use_multireddit and len(names) > 1:
+                # an a+b+c listing covers many communities in one paged request chain
+                for offset in range(0, len(names), self.MULTIREDDIT_SIZE):
+                    group = names[offset:offset + self.MULTIREDDIT_SIZE]
+                    for post in self.iter_posts('+'.join(group), limit * len(group), sort_type):
+                        bucket = posts.get((post['subreddit'] or '').lower())
+                        if bucket is not None and len(bucket) < limit:
+                            bucket.append(post)
             
-            comments = []
-            comment_count = 0
-            
-            for comment in submission.comments.list():
-                if comment_count >= limit:
-                    break
+            # busy communities crowd quiet ones out of a merged ranking; fetch those on their own
+            short = [name for name in names if len(posts[name.lower()]) < limit]
+            fetch = self._in_worker(lambda name: self.get_posts(name, limit, sort_type))
+            with ThreadPoolExecutor(max_workers=max_concurrency or self.max_concurrency) as executor:
+                for name, fetched in zip(short, executor.map(fetch, short)):
+                    posts[name.lower()] = fetched
+        
+        except Exception as e:
+            raise Exception(f"Error fetching Reddit posts: {str(e)}")
+        
+        return [{**post, 'source': name} for name in names for post in posts[name.lower()]]
+    
+    def search_posts_for_queries(self, queries, subreddit_names=None, limit=25, sort='relevance', time_filter='all',
+                                 max_concurrency=None):
+        queries = list(dict.fromkeys(queries))
+        # restricting to several communities is one multireddit search per query
+        subreddit_name = '+'.join(subreddit_names) if subreddit_names else None
+        
+        with ThreadPoolExecutor(max_workers=max_concurrency or self.max_concurrency) as executor:
+            results = executor.map(
+                self._in_worker(lambda query: self.search_posts(query, subreddit_name, limit, sort, time_filter)),
+                queries
+            )
+            return [{**post, 'source': query} for query, posts in zip(queries, results) for post in posts]
+    
+    def get_post_comments(self, post_id, limit=20, max_depth=None, min_score=None, more_budget=0):
+        return list(self.iter_post_comments(post_id, limit, max_depth, min_score, more_budget))
+    
+    def iter_post_comments(self, post_id, limit=20, max_depth=None, min_score=None, more_budget=0):
+        try:
+            with self._count_calls('get_post_comments'):
+                submission = self.reddit.submission(id=post_id)
+                # breadth first over the forest the submission fetch already loaded,
+                # so the top of the thread is scored before any deep reply chains
+                queue = deque(submission.comments)
+                yielded = 0
                 
-                if hasattr(comment, 'body') and comment.body != '[deleted]':
-                    comment_data = {
-                        'id': comment.id,
-                        'body': comment.body,
-                        'author': str(comment.author) if comment.author else '[deleted]',
-                        'created_utc': datetime.fromtimestamp(comment.created_utc),
-                        'score': comment.score,
-                        'parent_id': comment.parent_id,
-                        'depth': comment.depth
-                    }
-                    comments.append(comment_data)
-                    comment_count += 1
-            
-            return comments
+                while queue and yielded < limit:
+                    item = queue.popleft()
+                    
+                    if isinstance(item, MoreComments):
+                        if more_budget <= 0 or (max_depth is not None and item.depth > max_depth):
+                            continue
+                        # each expansion costs one request; stop expanding once the budget is spent
+                        more_budget -= 1
+                        item.submission = submission
+                        queue.extend(item.comments())
+                        continue
+                    
+                    data = vars(item)
+                    depth = data.get('depth', 0)
+                    if max_depth is not None and depth > max_depth:
+                        continue
+                    if min_score is not None and data.get('score', 0) < min_score:
+                        # a downvoted comment's replies are collapsed on reddit too
+                        continue
+                    
+                    if max_depth is None or depth < max_depth:
+                        queue.extend(item.replies)
+                    
+                    if data.get('body') in (None, '[deleted]', '[removed]'):
+                        continue
+                    
+                    yield self._comment_dict(item)
+                    yielded += 1
             
         except Exception as e:
             raise Exception(f"Error fetching comments: {str(e)}")
     
+    def iter_stream(self, subreddit_name, kind='submissions', skip_existing=True, pause_after=0):
+        if kind not in ('submissions', 'comments'):
+            raise ValueError(f"Unsupported stream kind: {kind}")
+        
+        try:
+            subreddit = self.reddit.subreddit(subreddit_name)
+            stream = getattr(subreddit.stream, kind)(skip_existing=skip_existing, pause_after=pause_after)
+            to_dict = self._post_dict if kind == 'submissions' else self._comment_dict
+            
+            method = f"stream_{kind}"
+            counted = self._request_count()
+            try:
+                # PRAW remembers only the last few hundred IDs it has seen, and a
+                # None marks a poll that returned nothing new
+                for item in stream:
+                    # a stream can run indefinitely, so its requests are reported as they happen
+                    counted = self._flush_calls(method, counted)
+                    yield None if item is None else to_dict(item)
+            finally:
+                self._flush_calls(method, counted)
+        
+        except Exception as e:
+            raise Exception(f"Error streaming Reddit {kind}: {str(e)}")
+    
     def search_posts(self, query, subreddit_name=None, limit=25, sort='relevance', time_filter='all'):
+        return list(self.iter_search_posts(query, subreddit_name, limit, sort, time_filter))
+    
+    def iter_search_posts(self, query, subreddit_name=None, limit=25, sort='relevance', time_filter='all'):
         try:
             if subreddit_name:
                 subreddit = self.reddit.subreddit(subreddit_name)
@@ -109,25 +330,9 @@ class RedditAnalyzer:
                     time_filter=time_filter
                 )
             
-            posts = []
-            for post in search_results:
-                post_data = {
-                    'id': post.id,
-                    'title': post.title,
-                    'selftext': post.selftext,
-                    'author': str(post.author) if post.author else '[deleted]',
-                    'created_utc': datetime.fromtimestamp(post.created_utc),
-                    'score': post.score,
-                    'upvote_ratio': post.upvote_ratio,
-                    'num_comments': post.num_comments,
-                    'url': post.url,
-                    'permalink': f"https://reddit.com{post.permalink}",
-                    'subreddit': post.subreddit.display_name,
-                    'is_self': post.is_self
-                }
-                posts.append(post_data)
-            
-            return posts
+            with self._count_calls('search_posts'):
+                for post in search_results:
+                    yield self._post_dict(post)
             
         except Exception as e:
             raise Exception(f"Error searching Reddit: {str(e)}")
@@ -152,6 +357,9 @@ class RedditAnalyzer:
             raise Exception(f"Error fetching subreddit info: {str(e)}")
     
     def get_user_posts(self, username, limit=25, sort='new'):
+        return list(self.iter_user_posts(username, limit, sort))
+    
+    def iter_user_posts(self, username, limit=25, sort='new'):
         try:
             user = self.reddit.redditor(username)
             
@@ -164,23 +372,9 @@ class RedditAnalyzer:
             else:
                 posts_iterator = user.submissions.new(limit=limit)
             
-            posts = []
-            for post in posts_iterator:
-                post_data = {
-                    'id': post.id,
-                    'title': post.title,
-                    'selftext': post.selftext,
-                    'author': str(post.author) if post.author else '[deleted]',
-                    'created_utc': datetime.fromtimestamp(post.created_utc),
-                    'score': post.score,
-                    'upvote_ratio': post.upvote_ratio,
-                    'num_comments': post.num_comments,
-                    'subreddit': post.subreddit.display_name,
-                    'permalink': f"https://reddit.com{post.permalink}"
-                }
-                posts.append(post_data)
-            
-            return posts
+            with self._count_calls('get_user_posts'):
+                for post in posts_iterator:
+                    yield self._post_dict(post)
             
         except Exception as e:
             raise Exception(f"Error fetching user posts: {str(e)}")
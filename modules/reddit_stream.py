@@ -0,0 +1,74 @@
+import time
+
+from modules.rolling_window import RollingSentiment
+
+class RedditStreamMonitor:
+    def __init__(self, analyzer, sentiment_engine, batch_size=25, max_latency=5.0,
+                 windows=RollingSentiment.DEFAULT_WINDOWS, clock=time.time):
+        self.analyzer = analyzer
+        self.sentiment_engine = sentiment_engine
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.clock = clock
+        self.rolling = RollingSentiment(windows, clock)
+        self.accumulator = sentiment_engine.create_accumulator()
+        self.stats = {'items': 0, 'batches': 0, 'started': None}
+
+    @staticmethod
+    def _item_text(item):
+        if 'body' in item:
+            return item['body']
+        return f"{item['title']} {item['selftext']}".strip()
+
+    def run(self, subreddit_name, kind='submissions', max_items=None, duration=None, skip_existing=True):
+        started = self.clock()
+        self.stats['started'] = self.stats['started'] or started
+        stream = self.analyzer.iter_stream(subreddit_name, kind, skip_existing)
+        batch = []
+        batch_started = None
+
+        try:
+            for item in stream:
+                now = self.clock()
+                if item is not None:
+                    batch.append(item)
+                    batch_started = batch_started or now
+
+                done = (
+                    (max_items is not None and self.stats['items'] + len(batch) >= max_items)
+                    or (duration is not None and now - started >= duration)
+                )
+                # flush on a full batch, an idle poll, or when the oldest item has waited long enough
+                if batch and (done or item is None or len(batch) >= self.batch_size
+                              or now - batch_started >= self.max_latency):
+                    yield self._flush(batch)
+                    batch = []
+                    batch_started = None
+                if done:
+                    break
+        finally:
+            stream.close()
+
+    def _flush(self, batch):
+        results = self.sentiment_engine.batch_analyze(
+            [self._item_text(item) for item in batch],
+            columnar=True
+        )
+        self.rolling.add([item['created_utc'].timestamp() for item in batch], results)
+        self.accumulator.update_many(results)
+
+        self.stats['items'] += len(batch)
+        self.stats['batches'] += 1
+        return batch, results
+
+    def get_summary(self):
+        return {
+            'windows': self.rolling.summary(),
+            'overall': self.accumulator.summary(),
+            'stream': {
+                'items': self.stats['items'],
+                'batches': self.stats['batches'],
+                'uptime_seconds': self.clock() - self.stats['started'] if self.stats['started'] else 0.0,
+                'window_memory_bytes': self.rolling.memory_bytes
+            }
+        }
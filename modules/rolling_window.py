@@ -0,0 +1,125 @@
+import math
+import time
+
+import numpy as np
+
+from modules.sentiment_results import LABELS
+
+class RingBufferWindow:
+    def __init__(self, span, bucket_seconds):
+        self.span = span
+        self.bucket_seconds = bucket_seconds
+        self.buckets = int(math.ceil(span / bucket_seconds))
+
+        # one slot per bucket, reused in place as time moves on: memory is fixed
+        # by span / bucket_seconds no matter how many items pass through
+        self.epoch = np.full(self.buckets, -1, dtype=np.int64)
+        self.label_counts = np.zeros((self.buckets, len(LABELS)), dtype=np.int64)
+        self.skipped = np.zeros(self.buckets, dtype=np.int64)
+        self.score_sum = np.zeros(self.buckets)
+        self.compound_sum = np.zeros(self.buckets)
+        self.compound_sq = np.zeros(self.buckets)
+
+    def _live_epochs(self, now):
+        current = int(now // self.bucket_seconds)
+        return current - self.buckets + 1, current
+
+    def add(self, timestamps, results, now):
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if len(timestamps) == 0:
+            return
+
+        oldest, current = self._live_epochs(now)
+        epochs = np.floor(timestamps / self.bucket_seconds).astype(np.int64)
+        # items from before the window are dropped; clock skew never reaches the future
+        epochs = np.minimum(epochs, current)
+        keep = epochs >= oldest
+        if not keep.all():
+            epochs = epochs[keep]
+            results = results.take(np.flatnonzero(keep))
+        if len(epochs) == 0:
+            return
+
+        slots = epochs % self.buckets
+        for slot, epoch in zip(*np.unique(np.stack([slots, epochs]), axis=1)):
+            if self.epoch[slot] < epoch:
+                self._clear(slot)
+                self.epoch[slot] = epoch
+
+        scored = results.scored if results.scored is not None else np.ones(len(epochs), dtype=bool)
+        np.add.at(self.skipped, slots[~scored], 1)
+
+        slots = slots[scored]
+        np.add.at(self.label_counts, (slots, results.label_code[scored]), 1)
+        np.add.at(self.score_sum, slots, results.score[scored])
+        np.add.at(self.compound_sum, slots, results.compound[scored])
+        np.add.at(self.compound_sq, slots, results.compound[scored] ** 2)
+
+    def _clear(self, slot):
+        self.label_counts[slot] = 0
+        self.skipped[slot] = 0
+        self.score_sum[slot] = 0.0
+        self.compound_sum[slot] = 0.0
+        self.compound_sq[slot] = 0.0
+
+    def summary(self, now):
+        oldest, current = self._live_epochs(now)
+        live = (self.epoch >= oldest) & (self.epoch <= current)
+
+        counts = self.label_counts[live].sum(axis=0)
+        total = int(counts.sum())
+        skipped = int(self.skipped[live].sum())
+        if not total:
+            return {'total_count': 0, 'skipped_count': skipped}
+
+        mean_compound = self.compound_sum[live].sum() / total
+        variance = max(self.compound_sq[live].sum() / total - mean_compound ** 2, 0.0)
+        positive, negative, neutral = (int(counts[LABELS.index(label)]) for label in ('Positive', 'Negative', 'Neutral'))
+
+        return {
+            'total_count': total,
+            'positive_count': positive,
+            'negative_count': negative,
+            'neutral_count': neutral,
+            'average_score': float(self.score_sum[live].sum() / total),
+            'average_compound': float(mean_compound),
+            'compound_std': math.sqrt(variance),
+            'sentiment_distribution': {
+                'positive_ratio': positive / total,
+                'negative_ratio': negative / total,
+                'neutral_ratio': neutral / total
+            },
+            'skipped_count': skipped
+        }
+
+    @property
+    def memory_bytes(self):
+        return sum(array.nbytes for array in (
+            self.epoch, self.label_counts, self.skipped,
+            self.score_sum, self.compound_sum, self.compound_sq
+        ))
+
+class RollingSentiment:
+    # (name, span, bucket width) in seconds
+    DEFAULT_WINDOWS = (
+        ('5m', 300, 10),
+        ('1h', 3600, 60),
+        ('24h', 86400, 900)
+    )
+
+    def __init__(self, windows=DEFAULT_WINDOWS, clock=time.time):
+        self.clock = clock
+        self.windows = {name: RingBufferWindow(span, bucket) for name, span, bucket in windows}
+
+    def add(self, timestamps, results):
+        now = self.clock()
+        for window in self.windows.values():
+            window.add(timestamps, results, now)
+
+    def summary(self):
+        now = self.clock()
+        return {name: window.summary(now) for name, window in self.windows.items()}
+
+    @property
+    def memory_bytes(self):
+        return sum(window.memory_bytes for window in self.windows.values())
@@ -0,0 +1,132 @@
+from collections import OrderedDict
+import hashlib
+import json
+import sqlite3
+import threading
+
+class SentimentCache:
+    def __init__(self, max_size=10000, db_path=None, commit_every=256):
+        self.max_size = max_size
+        self.db_path = db_path
+        self.commit_every = commit_every
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._uncommitted = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment_cache (key TEXT PRIMARY KEY, result TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def make_key(text, fingerprint=''):
+        digest = hashlib.sha1()
+        digest.update(str(fingerprint).encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(text.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(result)
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT result FROM sentiment_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    result = json.loads(row[0])
+                    self._store_memory(key, result)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return dict(result)
+
+            self.misses += 1
+            return None
+
+    def put(self, key, result):
+        self.put_many([(key, result)])
+
+    def put_many(self, items):
+        items = [(key, dict(result)) for key, result in items]
+        if not items:
+            return
+        with self._lock:
+            for key, result in items:
+                self._store_memory(key, result)
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO sentiment_cache (key, result) VALUES (?, ?)",
+                    [(key, json.dumps(result)) for key, result in items]
+                )
+                # uncommitted rows are already visible to this connection's reads,
+                # so the fsync is paid once per batch of writes, not once per text
+                self._uncommitted += len(items)
+                if self._uncommitted >= self.commit_every:
+                    self._commit()
+
+    def flush(self):
+        with self._lock:
+            self._commit()
+
+    def _commit(self):
+        if self._db is not None and self._uncommitted:
+            self._db.commit()
+            self._uncommitted = 0
+
+    def _store_memory(self, key, result):
+        if self.max_size <= 0:
+            return
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self):
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def clear(self):
+        self.invalidate()
+        if self._db is not None:
+            with self._lock:
+                self._db.execute("DELETE FROM sentiment_cache")
+                self._db.commit()
+                self._uncommitted = 0
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'persistent': self._db is not None
+            }
+
+    def close(self):
+        if self._db is not None:
+            with self._lock:
+                self._commit()
+                self._db.close()
+                self._db = None
@@ -1,58 +1,254 @@
 from textblob import TextBlob
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 import numpy as np
+import os
+import queue
+import re
+import threading
+import time
+
+from modules.sentiment_cache import SentimentCache
+from modules.compiled_vader import CompiledVader
+from modules.text_normalizer import TextNormalizer
+from modules.sentiment_results import SentimentResults, LABEL_CODES
+from modules.sentiment_summary import SentimentAccumulator
+from modules.deduplicator import TextDeduplicator
+from modules.stage_profiler import StageProfiler
+from modules.language_detector import LanguageDetector
+
+_worker_engine = None
+
+def _init_worker(config):
+    global _worker_engine
+    _worker_engine = SentimentEngine(**config)
+
+def _analyze_chunk(texts):
+    return _worker_engine.batch_analyze(texts, parallel=False)
+
+def _analyze_chunk_columnar(texts):
+    return _worker_engine.batch_analyze(texts, parallel=False, columnar=True)
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+_STREAM_END = object()
+
+class _StreamFailure:
+    def __init__(self, error):
+        self.error = error
 
 class SentimentEngine:
-    def __init__(self):
+    def __init__(self, workers=None, chunk_size=500, parallel_threshold=2000,
+                 cache_size=10000, cache_path=None, vader_weight=0.7, textblob_weight=0.3,
+                 positive_threshold=0.05, negative_threshold=-0.05, mode='full',
+                 cascade_band=None, vader_backend='stock', profile=False,
+                 window_words=120, max_windows=16, language_handler='score', accepted_languages=('en',)):
+        if mode not in ('full', 'cascade'):
+            raise ValueError(f"Unknown sentiment mode '{mode}'. Use 'full' or 'cascade'.")
+        if vader_backend not in ('stock', 'compiled'):
+            raise ValueError(f"Unknown VADER backend '{vader_backend}'. Use 'stock' or 'compiled'.")
+        self._check_language_handler(language_handler)
         self.vader_analyzer = SentimentIntensityAnalyzer()
+        self.vader_backend = vader_backend
+        self.compiled_vader = CompiledVader(self.vader_analyzer) if vader_backend == 'compiled' else None
+        self.vader_weight = vader_weight
+        self.textblob_weight = textblob_weight
+        self.positive_threshold = positive_threshold
+        self.negative_threshold = negative_threshold
+        self.mode = mode
+        self.cascade_band = cascade_band
+        self.cascade_stats = {'vader_only': 0, 'textblob_fallback': 0}
+        self.cache = SentimentCache(cache_size, cache_path) if cache_size or cache_path else None
+        self._cache_fingerprint = self._config_fingerprint()
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.parallel_threshold = parallel_threshold
+        self._pool = None
+        self._pool_key = None
+        self._pool_lock = threading.Lock()
+        self._warm_up_thread = None
+        self.profiler = StageProfiler() if profile else None
+        self._local = threading.local()
+        self.window_words = window_words
+        self.max_windows = max_windows
+        self.document_stats = {'documents': 0, 'windowed': 0, 'sampled': 0, 'windows': 0}
+        self.language_handler = language_handler
+        self.accepted_languages = tuple(accepted_languages)
+        self.language_detector = None
+        self.deduplicator = None
+        self.language_stats = {'metadata': 0, 'detected': 0, 'accepted': 0, 'skipped': 0, 'diverted': 0}
+        self.handler_calls = {}
+        self.last_handler = None
+    
+    @staticmethod
+    def _check_language_handler(language_handler):
+        if language_handler not in ('score', 'skip') and not callable(language_handler):
+            raise ValueError(f"Unknown language handler '{language_handler}'. Use 'score', 'skip' or a callable backend.")
+    
+    def enable_profiling(self):
+        if self.profiler is None:
+            self.profiler = StageProfiler()
+        return self.profiler
+    
+    def disable_profiling(self):
+        self.profiler = None
+    
+    def get_profile_snapshot(self):
+        if self.profiler is None:
+            return {}
+        return self.profiler.snapshot()
+    
+    @contextmanager
+    def _using_profiler(self, profiler):
+        # per-call profilers live on the calling thread so a shared engine never
+        # mixes timings from concurrent callers
+        previous = getattr(self._local, 'profiler', None)
+        if profiler is not None:
+            self._local.profiler = profiler
+        try:
+            yield
+        finally:
+            self._local.profiler = previous
+    
+    def _active_profiler(self):
+        profiler = getattr(self._local, 'profiler', None)
+        return profiler if profiler is not None else self.profiler
+    
+    def _timed(self, stage, func, *args):
+        profiler = self._active_profiler()
+        if profiler is None:
+            return func(*args)
+        start = time.perf_counter()
+        result = func(*args)
+        profiler.record(stage, time.perf_counter() - start)
+        return result
+    
+    def _record_stage(self, stage, start, count):
+        profiler = self._active_profiler()
+        if profiler is not None:
+            profiler.record(stage, time.perf_counter() - start, count)
     
     def analyze_sentiment(self, text):
         if not text or text.strip() == "":
-            return {
-                'label': 'Neutral',
-                'score': 0.0,
-                'positive': 0.0,
-                'negative': 0.0,
-                'neutral': 1.0,
-                'compound': 0.0
-            }
+            return self._empty_result()
         
-        cleaned_text = self._clean_text(text)
+        cleaned_text = self._timed('clean', self._clean_text, text)
         
-        vader_scores = self.vader_analyzer.polarity_scores(cleaned_text)
+        cache_key = self._cache_key(cleaned_text)
+        if cache_key is not None:
+            cached = self._timed('cache', self.cache.get, cache_key)
+            if cached is not None:
+                return cached
         
-        blob = TextBlob(cleaned_text)
-        textblob_polarity = blob.sentiment.polarity
-        textblob_subjectivity = blob.sentiment.subjectivity
+        combined_sentiment = self._score_cleaned(cleaned_text)
         
-        combined_sentiment = self._combine_sentiments(vader_scores, textblob_polarity)
+        if cache_key is not None:
+            self.cache.put(cache_key, combined_sentiment)
         
         return combined_sentiment
     
-    def _clean_text(self, text):
-        import re
+    def _empty_result(self):
+        return {
+            'label': 'Neutral',
+            'score': 0.0,
+            'positive': 0.0,
+            'negative': 0.0,
+            'neutral': 1.0,
+            'compound': 0.0
+        }
+    
+    def _vader_scores(self, cleaned_text):
+        # the compiled backend only pays off across a batch; a single text is
+        # cheaper through stock VADER, which it matches to within rounding (<= 1e-3)
+        return self.vader_analyzer.polarity_scores(cleaned_text)
+    
+    def _score_cleaned(self, cleaned_text, vader_scores=None):
+        if vader_scores is None:
+            vader_scores = self._timed('vader', self._vader_scores, cleaned_text)
         
-        text = re.sub(r'http\S+|www.\S+', '', text)
-                
-        text = re.sub(r'@\w+|#\w+', '', text)
-                
-        text = ' '.join(text.split())
+        if self.mode == 'cascade' and abs(vader_scores['compound']) >= self.get_cascade_band():
+            self.cascade_stats['vader_only'] += 1
+            return self._timed('combine', self._combine_sentiments, vader_scores, None)
+        
+        if self.mode == 'cascade':
+            self.cascade_stats['textblob_fallback'] += 1
+        
+        textblob_polarity = self._timed('textblob', self._textblob_polarity, cleaned_text)
         
-        return text
+        return self._timed('combine', self._combine_sentiments, vader_scores, textblob_polarity)
+    
+    def _textblob_polarity(self, cleaned_text):
+        return TextBlob(cleaned_text).sentiment.polarity
+    
+    def get_cascade_band(self):
+        if self.cascade_band is not None:
+            return self.cascade_band
+        # TextBlob polarity lies in [-1, 1], so beyond this VADER compound
+        # no TextBlob score can move the combined value across a threshold.
+        threshold = max(self.positive_threshold, -self.negative_threshold)
+        return (threshold + abs(self.textblob_weight)) / self.vader_weight
+    
+    def get_cascade_stats(self):
+        vader_only = self.cascade_stats['vader_only']
+        fallback = self.cascade_stats['textblob_fallback']
+        total = vader_only + fallback
+        return {
+            'mode': self.mode,
+            'band': self.get_cascade_band(),
+            'scored': total,
+            'vader_only': vader_only,
+            'textblob_fallback': fallback,
+            'fallback_ratio': fallback / total if total else 0.0
+        }
+    
+    def _record_cascade(self, result):
+        if self.mode != 'cascade' or 'textblob_polarity' not in result:
+            return
+        if result['textblob_polarity'] is None:
+            self.cascade_stats['vader_only'] += 1
+        else:
+            self.cascade_stats['textblob_fallback'] += 1
+    
+    def _config_fingerprint(self):
+        return (self.vader_weight, self.textblob_weight,
+                self.positive_threshold, self.negative_threshold,
+                self.mode, self.cascade_band)
+    
+    def _cache_key(self, cleaned_text):
+        if self.cache is None:
+            return None
+        
+        fingerprint = self._config_fingerprint()
+        if fingerprint != self._cache_fingerprint:
+            self.cache.invalidate()
+            self._cache_fingerprint = fingerprint
+        
+        return SentimentCache.make_key(cleaned_text, fingerprint)
+    
+    def get_cache_stats(self):
+        if self.cache is None:
+            return {}
+        return self.cache.get_stats()
+    
+    def _clean_text(self, text):
+        return TextNormalizer.normalize(text)
     
     def _combine_sentiments(self, vader_scores, textblob_polarity):        
                 
         textblob_normalized = textblob_polarity
-                
-        vader_weight = 0.7
-        textblob_weight = 0.3
         
-        combined_compound = (vader_scores['compound'] * vader_weight + 
-                           textblob_normalized * textblob_weight)
+        if textblob_polarity is None:
+            # cascade rows skip TextBlob; its term counts as zero so the compound
+            # stays on the same weighted scale as rows that did use it
+            textblob_normalized = 0.0
+        
+        combined_compound = (vader_scores['compound'] * self.vader_weight + 
+                           textblob_normalized * self.textblob_weight)
                 
-        if combined_compound >= 0.05:
+        if combined_compound >= self.positive_threshold:
             label = 'Positive'
-        elif combined_compound <= -0.05:
+        elif combined_compound <= self.negative_threshold:
             label = 'Negative'
         else:
             label = 'Neutral'
@@ -69,32 +265,587 @@ class SentimentEngine:
             'textblob_polarity': textblob_polarity
         }
     
-    def batch_analyze(self, texts):        
+    def batch_analyze(self, texts, parallel=True, workers=None, chunk_size=None, columnar=False, languages=None,
+                      profiler=None, language_handler=None):
+        texts = list(texts)
+        if language_handler is None:
+            language_handler = self.language_handler
+        else:
+            self._check_language_handler(language_handler)
+        # the handler is chosen per call, so the stats count what each call actually used
+        self.last_handler = self._handler_name(language_handler)
+        self.handler_calls[self.last_handler] = self.handler_calls.get(self.last_handler, 0) + 1
+        with self._using_profiler(profiler):
+            if language_handler != 'score':
+                results = self._routed_analyze(texts, languages, parallel, workers, chunk_size, columnar,
+                                               language_handler)
+            else:
+                results = self._batch_analyze(texts, parallel, workers, chunk_size, columnar)
+        if self.cache is not None:
+            # one commit per batch on the SQLite tier
+            self.cache.flush()
+        return results
+    
+    def _batch_analyze(self, texts, parallel, workers, chunk_size, columnar):
+        workers = workers or self.workers
+        chunk_size = max(1, chunk_size or self.chunk_size)
+        
+        if not parallel or workers <= 1 or len(texts) < self.parallel_threshold:
+            if columnar:
+                return self._columnar_analyze(texts)
+            return self._serial_analyze(texts)
+        
+        if columnar:
+            def score_in_pool(pending_texts, cleaned_texts):
+                chunks = [pending_texts[i:i + chunk_size] for i in range(0, len(pending_texts), chunk_size)]
+                start = time.perf_counter()
+                scored = SentimentResults.concatenate(self._get_pool(workers).map(_analyze_chunk_columnar, chunks))
+                self._record_stage('parallel', start, len(pending_texts))
+                self._record_cascade_batch(scored.textblob_polarity)
+                return scored
+            
+            return self._columnar_cached(texts, score_in_pool)
+        
+        results, pending, _, pending_keys = self._lookup_batch(texts)
+        
+        pending_texts = [texts[i] for i in pending]
+        chunks = [pending_texts[i:i + chunk_size] for i in range(0, len(pending_texts), chunk_size)]
+        
+        scored = []
+        if chunks:
+            start = time.perf_counter()
+            pool = self._get_pool(workers)
+            for chunk_results in pool.map(_analyze_chunk, chunks):
+                scored.extend(chunk_results)
+            self._record_stage('parallel', start, len(pending_texts))
+        
+        for index, result in zip(pending, scored):
+            results[index] = result
+            self._record_cascade(result)
+        self._store_batch(pending_keys, scored)
+        return results
+    
+    def route_languages(self, texts, languages=None):
+        if isinstance(languages, str):
+            languages = [languages] * len(texts)
+        if self.language_detector is None:
+            self.language_detector = LanguageDetector()
+        
+        start = time.perf_counter()
+        codes = []
+        for index, text in enumerate(texts):
+            code = LanguageDetector.normalize_code(languages[index]) if languages is not None else None
+            if code is None or code in LanguageDetector.UNDETERMINED_CODES:
+                code = self.language_detector.detect(text)
+                self.language_stats['detected'] += 1
+            else:
+                self.language_stats['metadata'] += 1
+            codes.append(code)
+        self._record_stage('language', start, len(texts))
+        return codes
+    
+    def _accepts_language(self, code):
+        # texts too short to call are scored rather than dropped
+        return code in self.accepted_languages or code == LanguageDetector.UNDETERMINED
+    
+    def _routed_analyze(self, texts, languages, parallel, workers, chunk_size, columnar, language_handler):
+        codes = self.route_languages(texts, languages)
+        accepted = [i for i, code in enumerate(codes) if self._accepts_language(code)]
+        diverted = [i for i, code in enumerate(codes) if not self._accepts_language(code)]
+        
+        scored = self._batch_analyze([texts[i] for i in accepted], parallel, workers, chunk_size, columnar)
+        
+        backend_results = None
+        if diverted and callable(language_handler):
+            backend_results = list(language_handler([texts[i] for i in diverted], [codes[i] for i in diverted]))
+            self.language_stats['diverted'] += len(diverted)
+        else:
+            self.language_stats['skipped'] += len(diverted)
+        self.language_stats['accepted'] += len(accepted)
+        
+        if columnar:
+            results = SentimentResults.empty(len(texts)).put(accepted, scored)
+            results.language = np.array(codes, dtype=object)
+            results.scored = np.zeros(len(texts), dtype=bool)
+            results.scored[accepted] = True
+            if backend_results is not None:
+                results.put(diverted, SentimentResults.from_dicts(backend_results))
+                results.scored[diverted] = True
+            return results
+        
+        results = [None] * len(texts)
+        for index, result in zip(accepted, scored):
+            results[index] = dict(result, language=codes[index], scored=True)
+        for position, index in enumerate(diverted):
+            if backend_results is not None:
+                results[index] = dict(backend_results[position], language=codes[index], scored=True)
+            else:
+                results[index] = dict(self._empty_result(), language=codes[index], scored=False)
+        return results
+    
+    @staticmethod
+    def _handler_name(language_handler):
+        return language_handler if isinstance(language_handler, str) else 'backend'
+    
+    def get_language_stats(self):
+        routed = self.language_stats['accepted'] + self.language_stats['skipped'] + self.language_stats['diverted']
+        return {
+            **self.language_stats,
+            'handler': self.last_handler or self._handler_name(self.language_handler),
+            'default_handler': self._handler_name(self.language_handler),
+            'handler_calls': dict(self.handler_calls),
+            'accepted_languages': list(self.accepted_languages),
+            'routed': routed,
+            'skipped_ratio': self.language_stats['skipped'] / routed if routed else 0.0
+        }
+    
+    def analyze_deduplicated(self, texts, deduplicator=None, columnar=False, **batch_options):
+        texts = list(texts)
+        if deduplicator is None:
+            # the default deduplicator lives on the engine so its savings show up in get_dedup_stats
+            if self.deduplicator is None:
+                self.deduplicator = TextDeduplicator()
+            deduplicator = self.deduplicator
+        cluster_ids, representatives = deduplicator.cluster(texts)
+        
+        scored = self.batch_analyze([texts[i] for i in representatives], columnar=columnar, **batch_options)
+        
+        if columnar:
+            results = scored.take(cluster_ids)
+            results.cluster_id = np.asarray(cluster_ids, dtype=np.int64)
+            return results
+        
         results = []
-        for text in texts:
-            results.append(self.analyze_sentiment(text))
+        for cluster_id in cluster_ids:
+            result = dict(scored[cluster_id])
+            result['cluster_id'] = cluster_id
+            results.append(result)
         return results
     
-    def get_sentiment_summary(self, sentiments):        
-        if not sentiments:
-            return {}
+    def analyze_stream(self, records, text_key=None, batch_size=256, max_wait=1.0, prefetch=0):
+        # records are read on a background thread so a partial batch can be
+        # flushed on time even while the source is stalled mid-fetch
+        buffer, stopped = self._start_reader(records, prefetch or batch_size)
+        
+        batch = []
+        deadline = None
+        try:
+            while True:
+                timeout = max(deadline - time.monotonic(), 0.0) if batch else None
+                try:
+                    item = buffer.get(timeout=timeout)
+                except queue.Empty:
+                    yield from self._score_records(batch, text_key)
+                    batch = []
+                    continue
+                
+                if item is _STREAM_END:
+                    break
+                if isinstance(item, _StreamFailure):
+                    yield from self._score_records(batch, text_key)
+                    raise item.error
+                
+                if not batch:
+                    deadline = time.monotonic() + max_wait
+                batch.append(item)
+                if len(batch) >= batch_size or time.monotonic() >= deadline:
+                    yield from self._score_records(batch, text_key)
+                    batch = []
+            
+            if batch:
+                yield from self._score_records(batch, text_key)
+        finally:
+            stopped.set()
+    
+    def _score_records(self, records, text_key):
+        texts = [self._record_text(record, text_key) for record in records]
+        return zip(records, self.batch_analyze(texts))
+    
+    @staticmethod
+    def _record_text(record, text_key):
+        if text_key is None:
+            return record
+        if callable(text_key):
+            return text_key(record)
+        return record.get(text_key) or ""
+    
+    @staticmethod
+    def _start_reader(records, size):
+        buffer = queue.Queue(maxsize=size)
+        stopped = threading.Event()
+        
+        def offer(item):
+            while not stopped.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
         
-        labels = [s['label'] for s in sentiments]
-        scores = [s['score'] for s in sentiments]
-        compounds = [s['compound'] for s in sentiments]
-        
-        summary = {
-            'total_count': len(sentiments),
-            'positive_count': labels.count('Positive'),
-            'negative_count': labels.count('Negative'),
-            'neutral_count': labels.count('Neutral'),
-            'average_score': np.mean(scores),
-            'average_compound': np.mean(compounds),
-            'sentiment_distribution': {
-                'positive_ratio': labels.count('Positive') / len(labels),
-                'negative_ratio': labels.count('Negative') / len(labels),
-                'neutral_ratio': labels.count('Neutral') / len(labels)
+        def produce():
+            try:
+                for record in records:
+                    if not offer(record):
+                        return
+            except Exception as e:
+                offer(_StreamFailure(e))
+                return
+            offer(_STREAM_END)
+        
+        threading.Thread(target=produce, daemon=True).start()
+        return buffer, stopped
+    
+    def _serial_analyze(self, texts):
+        if self.compiled_vader is None:
+            results = []
+            for text in texts:
+                results.append(self.analyze_sentiment(text))
+            return results
+        
+        results, pending, cleaned_texts, pending_keys = self._lookup_batch(texts)
+        start = time.perf_counter()
+        vader_batch = self.compiled_vader.polarity_scores_batch(cleaned_texts)
+        self._record_stage('vader', start, len(cleaned_texts))
+        
+        scored = []
+        for index, cleaned_text, vader_scores in zip(pending, cleaned_texts, vader_batch):
+            results[index] = self._score_cleaned(cleaned_text, vader_scores)
+            scored.append(results[index])
+        self._store_batch(pending_keys, scored)
+        return results
+    
+    def _columnar_analyze(self, texts):
+        return self._columnar_cached(texts, lambda pending_texts, cleaned_texts: self._score_columnar(cleaned_texts))
+    
+    def _columnar_cached(self, texts, score_pending):
+        size = len(texts)
+        present = [i for i, text in enumerate(texts) if text and text.strip() != ""]
+        start = time.perf_counter()
+        cleaned_texts = TextNormalizer.normalize_batch([texts[i] for i in present])
+        self._record_stage('clean', start, len(present))
+        
+        results = SentimentResults.empty(size)
+        pending = list(range(len(present)))
+        keys = None
+        if self.cache is not None:
+            keys = [self._cache_key(cleaned_text) for cleaned_text in cleaned_texts]
+            start = time.perf_counter()
+            cached = [self.cache.get(key) for key in keys]
+            self._record_stage('cache', start, len(keys))
+            
+            hits = [j for j, result in enumerate(cached) if result is not None]
+            if hits:
+                results.put([present[j] for j in hits], SentimentResults.from_dicts(cached[j] for j in hits))
+            pending = [j for j, result in enumerate(cached) if result is None]
+        
+        if pending:
+            # only the misses are scored; their rows are scattered back into place
+            scored = score_pending([texts[present[j]] for j in pending], [cleaned_texts[j] for j in pending])
+            results.put([present[j] for j in pending], scored)
+            if keys is not None:
+                self._store_batch([keys[j] for j in pending], scored.to_dicts())
+        return results
+    
+    def _score_columnar(self, cleaned_texts):
+        start = time.perf_counter()
+        if self.compiled_vader is not None:
+            vader = self.compiled_vader.score_arrays(cleaned_texts)
+        else:
+            vader = {key: np.empty(len(cleaned_texts)) for key in ('neg', 'neu', 'pos', 'compound')}
+            for j, cleaned_text in enumerate(cleaned_texts):
+                scores = self.vader_analyzer.polarity_scores(cleaned_text)
+                for key in vader:
+                    vader[key][j] = scores[key]
+        self._record_stage('vader', start, len(cleaned_texts))
+        
+        vader_compound = vader['compound']
+        if self.mode == 'cascade':
+            needs_textblob = np.abs(vader_compound) < self.get_cascade_band()
+        else:
+            needs_textblob = np.ones(len(cleaned_texts), dtype=bool)
+        
+        textblob_polarity = np.full(len(cleaned_texts), np.nan)
+        for j in np.flatnonzero(needs_textblob):
+            textblob_polarity[j] = self._timed('textblob', self._textblob_polarity, cleaned_texts[j])
+        self._record_cascade_batch(textblob_polarity)
+        
+        start = time.perf_counter()
+        combined = vader_compound * self.vader_weight + np.nan_to_num(textblob_polarity) * self.textblob_weight
+        label_code = self._label_codes(combined)
+        self._record_stage('combine', start, len(cleaned_texts))
+        
+        return SentimentResults(combined, vader['pos'], vader['neg'], vader['neu'], textblob_polarity, label_code)
+    
+    def _label_codes(self, combined):
+        return np.where(
+            combined >= self.positive_threshold, LABEL_CODES['Positive'],
+            np.where(combined <= self.negative_threshold, LABEL_CODES['Negative'], LABEL_CODES['Neutral'])
+        )
+    
+    def split_document(self, text):
+        words = text.split() if text else []
+        if len(words) <= self.window_words:
+            return [(text, len(words))] if words else []
+        
+        windows = []
+        current = []
+        for sentence in _SENTENCE_BOUNDARY.split(text):
+            sentence_words = sentence.split()
+            while len(sentence_words) > self.window_words:
+                if current:
+                    windows.append(current)
+                    current = []
+                windows.append(sentence_words[:self.window_words])
+                sentence_words = sentence_words[self.window_words:]
+            if current and len(current) + len(sentence_words) > self.window_words:
+                windows.append(current)
+                current = []
+            current.extend(sentence_words)
+        if current:
+            windows.append(current)
+        
+        self.document_stats['windowed'] += 1
+        if self.max_windows and len(windows) > self.max_windows:
+            # evenly spaced windows keep the opening, middle and ending in the sample
+            picks = np.linspace(0, len(windows) - 1, self.max_windows).round().astype(np.int64)
+            windows = [windows[i] for i in picks]
+            self.document_stats['sampled'] += 1
+        
+        return [(' '.join(window), len(window)) for window in windows]
+    
+    def analyze_documents(self, texts, columnar=False, languages=None, profiler=None, **batch_options):
+        with self._using_profiler(profiler):
+            texts = list(texts)
+            
+            start = time.perf_counter()
+            windows, weights, owners = self._collect_windows(texts)
+            self._record_stage('split', start, len(texts))
+            
+            scored = self.batch_analyze(windows, columnar=True, languages=self._window_languages(languages, owners),
+                                        **batch_options)
+            results = self._aggregate_windows(scored, weights, owners, len(texts))
+            return results if columnar else results.to_dicts()
+    
+    def analyze_document(self, text):
+        return self.analyze_documents([text])[0]
+    
+    def analyze_posts(self, titles, bodies, columnar=False, languages=None, profiler=None, **batch_options):
+        with self._using_profiler(profiler):
+            titles = list(titles)
+            bodies = list(bodies)
+            if len(titles) != len(bodies):
+                raise ValueError("titles and bodies must have the same length")
+            
+            start = time.perf_counter()
+            title_windows, title_weights, title_owners = self._collect_windows(titles)
+            body_windows, body_weights, body_owners = self._collect_windows(bodies)
+            # the post is scored on the joined text, as a whole unless it exceeds the window budget
+            post_windows, post_weights, post_owners = self._collect_windows(
+                [title + " " + body for title, body in zip(titles, bodies)]
+            )
+            self._record_stage('split', start, len(titles) + len(bodies))
+            
+            title_end = len(title_windows)
+            body_end = title_end + len(body_windows)
+            owners = np.concatenate([title_owners, body_owners, post_owners])
+            scored = self.batch_analyze(title_windows + body_windows + post_windows, columnar=True,
+                                        languages=self._window_languages(languages, owners), **batch_options)
+            
+            results = {
+                'title': self._aggregate_windows(scored[:title_end], title_weights, title_owners, len(titles)),
+                'body': self._aggregate_windows(scored[title_end:body_end], body_weights, body_owners, len(bodies)),
+                'post': self._aggregate_windows(scored[body_end:], post_weights, post_owners, len(titles))
             }
+            if columnar:
+                return results
+            return {part: part_results.to_dicts() for part, part_results in results.items()}
+    
+    def get_dedup_stats(self):
+        if self.deduplicator is None:
+            return {}
+        return self.deduplicator.get_stats()
+    
+    def get_document_stats(self):
+        windowed = self.document_stats['windowed']
+        return {
+            **self.document_stats,
+            'window_words': self.window_words,
+            'max_windows': self.max_windows,
+            'sampled_ratio': self.document_stats['sampled'] / windowed if windowed else 0.0
+        }
+    
+    def _collect_windows(self, texts):
+        windows = []
+        weights = []
+        owners = []
+        for owner, text in enumerate(texts):
+            for window, weight in self.split_document(text):
+                windows.append(window)
+                weights.append(weight)
+                owners.append(owner)
+        self.document_stats['documents'] += len(texts)
+        self.document_stats['windows'] += len(windows)
+        return windows, np.asarray(weights, dtype=np.float64), np.asarray(owners, dtype=np.int64)
+    
+    @staticmethod
+    def _window_languages(languages, owners):
+        if languages is None or isinstance(languages, str):
+            return languages
+        return [languages[owner] for owner in owners]
+    
+    def _aggregate_windows(self, scored, weights, owners, size):
+        if scored.scored is not None:
+            # windows routed away by language carry no weight
+            weights = weights * scored.scored
+        
+        # length-weighted mean of the window scores for each document
+        def weighted_mean(values, mask=None):
+            if mask is not None:
+                values, window_weights, window_owners = values[mask], weights[mask], owners[mask]
+            else:
+                window_weights, window_owners = weights, owners
+            totals = np.bincount(window_owners, weights=values * window_weights, minlength=size)
+            mass = np.bincount(window_owners, weights=window_weights, minlength=size)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return totals / mass
+        
+        results = SentimentResults.empty(size)
+        scored_documents = np.bincount(owners, weights=weights, minlength=size) > 0
+        if scored.scored is not None:
+            # empty documents have no windows to route; they are neutral, not skipped by language
+            results.scored = scored_documents | (np.bincount(owners, minlength=size) == 0)
+            results.language = np.full(size, LanguageDetector.UNDETERMINED, dtype=object)
+            for owner, code in zip(owners[::-1], scored.language[::-1]):
+                results.language[owner] = code
+        if not scored_documents.any():
+            return results
+        
+        compound = weighted_mean(scored.compound)[scored_documents]
+        results.compound[scored_documents] = compound
+        results.score = np.abs(results.compound)
+        results.positive[scored_documents] = weighted_mean(scored.positive)[scored_documents]
+        results.negative[scored_documents] = weighted_mean(scored.negative)[scored_documents]
+        results.neutral[scored_documents] = weighted_mean(scored.neutral)[scored_documents]
+        results.textblob_polarity[:] = weighted_mean(
+            scored.textblob_polarity, ~np.isnan(scored.textblob_polarity)
+        )
+        results.label_code[scored_documents] = self._label_codes(compound)
+        return results
+    
+    def _record_cascade_batch(self, textblob_polarity):
+        if self.mode != 'cascade':
+            return
+        fallback = int(np.count_nonzero(~np.isnan(textblob_polarity)))
+        self.cascade_stats['textblob_fallback'] += fallback
+        self.cascade_stats['vader_only'] += len(textblob_polarity) - fallback
+    
+    def _lookup_batch(self, texts):
+        results = [None] * len(texts)
+        pending = []
+        cleaned_texts = []
+        pending_keys = []
+        for index, text in enumerate(texts):
+            if not text or text.strip() == "":
+                results[index] = self._empty_result()
+                continue
+            
+            cleaned_text = self._timed('clean', self._clean_text, text)
+            cache_key = self._cache_key(cleaned_text)
+            if cache_key is not None:
+                results[index] = self._timed('cache', self.cache.get, cache_key)
+            if results[index] is None:
+                pending.append(index)
+                cleaned_texts.append(cleaned_text)
+                pending_keys.append(cache_key)
+        return results, pending, cleaned_texts, pending_keys
+    
+    def _store_batch(self, keys, results):
+        if self.cache is not None:
+            self.cache.put_many((key, result) for key, result in zip(keys, results) if key is not None)
+    
+    def _worker_config(self):
+        return {
+            'workers': 1,
+            'cache_size': 0,
+            'vader_weight': self.vader_weight,
+            'textblob_weight': self.textblob_weight,
+            'positive_threshold': self.positive_threshold,
+            'negative_threshold': self.negative_threshold,
+            'mode': self.mode,
+            'cascade_band': self.cascade_band,
+            'vader_backend': self.vader_backend
         }
+    
+    def _get_pool(self, workers):
+        config = self._worker_config()
+        pool_key = (workers, sorted(config.items()))
+        with self._pool_lock:
+            if self._pool is None or self._pool_key != pool_key:
+                self._shutdown_pool()
+                self._pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_worker,
+                    initargs=(config,)
+                )
+                self._pool_key = pool_key
+            return self._pool
+    
+    def warm_up(self, background=True):
+        if self._warm_up_thread is not None:
+            return self._warm_up_thread
+        
+        def load():
+            # TextBlob loads its pattern lexicon on the first .sentiment access
+            TextBlob("warm up").sentiment
         
-        return summary
+        if not background:
+            load()
+            return None
+        
+        self._warm_up_thread = threading.Thread(target=load, daemon=True)
+        self._warm_up_thread.start()
+        return self._warm_up_thread
+    
+    def _shutdown_pool(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+            self._pool_key = None
+    
+    def close(self):
+        self._shutdown_pool()
+        if self.cache is not None:
+            self.cache.close()
+    
+    def get_sentiment_summary(self, sentiments):        
+        return self.create_accumulator(sentiments).summary()
+    
+    def create_accumulator(self, sentiments=None):
+        accumulator = SentimentAccumulator()
+        if sentiments is not None:
+            accumulator.update_many(sentiments)
+        return accumulator
+    
+    def get_grouped_summary(self, sentiments, groups):
+        groups = np.asarray(groups, dtype=object)
+        if len(groups) != len(sentiments):
+            raise ValueError("groups must have one entry per sentiment")
+        
+        accumulators = {}
+        for group in dict.fromkeys(groups):
+            indices = np.flatnonzero(groups == group)
+            if isinstance(sentiments, SentimentResults):
+                accumulators[group] = self.create_accumulator(sentiments.take(indices))
+            else:
+                accumulators[group] = self.create_accumulator([sentiments[i] for i in indices])
+        
+        # the combined view merges the per-group accumulators instead of rescanning
+        combined = SentimentAccumulator()
+        for accumulator in accumulators.values():
+            combined.merge(accumulator)
+        
+        return {
+            'combined': combined.summary(),
+            'groups': {group: accumulator.summary() for group, accumulator in accumulators.items()}
+        }
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+LABELS = ('Negative', 'Neutral', 'Positive')
+LABEL_CODES = {label: code for code, label in enumerate(LABELS)}
+_LABEL_ARRAY = np.array(LABELS, dtype=object)
+
+COLUMNS = ('compound', 'score', 'positive', 'negative', 'neutral', 'textblob_polarity')
+EXTRA_COLUMNS = ('cluster_id', 'language', 'scored')
+
+class SentimentResults:
+    def __init__(self, compound, positive, negative, neutral, textblob_polarity, label_code):
+        self.compound = np.ascontiguousarray(compound, dtype=np.float64)
+        self.score = np.abs(self.compound)
+        self.positive = np.ascontiguousarray(positive, dtype=np.float64)
+        self.negative = np.ascontiguousarray(negative, dtype=np.float64)
+        self.neutral = np.ascontiguousarray(neutral, dtype=np.float64)
+        self.textblob_polarity = np.ascontiguousarray(textblob_polarity, dtype=np.float64)
+        self.label_code = np.ascontiguousarray(label_code, dtype=np.int8)
+        self.cluster_id = None
+        self.language = None
+        self.scored = None
+
+    @classmethod
+    def empty(cls, size=0):
+        return cls(
+            np.zeros(size), np.zeros(size), np.zeros(size), np.ones(size),
+            np.full(size, np.nan), np.full(size, LABEL_CODES['Neutral'], dtype=np.int8)
+        )
+
+    @classmethod
+    def from_dicts(cls, results):
+        results = list(results)
+        textblob = [r.get('textblob_polarity') for r in results]
+        return cls(
+            [r['compound'] for r in results],
+            [r['positive'] for r in results],
+            [r['negative'] for r in results],
+            [r['neutral'] for r in results],
+            [np.nan if value is None else value for value in textblob],
+            [LABEL_CODES[r['label']] for r in results]
+        )
+
+    @classmethod
+    def concatenate(cls, parts):
+        parts = list(parts)
+        if not parts:
+            return cls.empty()
+        return cls(
+            np.concatenate([p.compound for p in parts]),
+            np.concatenate([p.positive for p in parts]),
+            np.concatenate([p.negative for p in parts]),
+            np.concatenate([p.neutral for p in parts]),
+            np.concatenate([p.textblob_polarity for p in parts]),
+            np.concatenate([p.label_code for p in parts])
+        )
+
+    def take(self, indices):
+        indices = np.asarray(indices, dtype=np.int64)
+        results = SentimentResults(
+            self.compound[indices], self.positive[indices], self.negative[indices],
+            self.neutral[indices], self.textblob_polarity[indices], self.label_code[indices]
+        )
+        return self._copy_extras(results, indices)
+
+    def put(self, indices, other):
+        indices = np.asarray(indices, dtype=np.int64)
+        self.compound[indices] = other.compound
+        self.positive[indices] = other.positive
+        self.negative[indices] = other.negative
+        self.neutral[indices] = other.neutral
+        self.textblob_polarity[indices] = other.textblob_polarity
+        self.label_code[indices] = other.label_code
+        self.score = np.abs(self.compound)
+        return self
+
+    def _copy_extras(self, results, index):
+        for column in EXTRA_COLUMNS:
+            values = getattr(self, column)
+            if values is not None:
+                setattr(results, column, values[index])
+        return results
+
+    @property
+    def labels(self):
+        return _LABEL_ARRAY[self.label_code]
+
+    def __len__(self):
+        return len(self.compound)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            results = SentimentResults(
+                self.compound[index], self.positive[index], self.negative[index],
+                self.neutral[index], self.textblob_polarity[index], self.label_code[index]
+            )
+            return self._copy_extras(results, index)
+
+        textblob = self.textblob_polarity[index]
+        row = {
+            'label': LABELS[self.label_code[index]],
+            'score': float(self.score[index]),
+            'positive': float(self.positive[index]),
+            'negative': float(self.negative[index]),
+            'neutral': float(self.neutral[index]),
+            'compound': float(self.compound[index]),
+            'textblob_polarity': None if np.isnan(textblob) else float(textblob)
+        }
+        if self.cluster_id is not None:
+            row['cluster_id'] = int(self.cluster_id[index])
+        if self.language is not None:
+            row['language'] = self.language[index]
+        if self.scored is not None:
+            row['scored'] = bool(self.scored[index])
+        return row
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def to_dicts(self):
+        return list(self)
+
+    def to_dataframe(self):
+        data = {'label': pd.Categorical.from_codes(self.label_code, categories=LABELS)}
+        for column in COLUMNS:
+            data[column] = getattr(self, column)
+        for column in EXTRA_COLUMNS:
+            if getattr(self, column) is not None:
+                data[column] = getattr(self, column)
+        return pd.DataFrame(data, copy=False)
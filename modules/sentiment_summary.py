@@ -0,0 +1,230 @@
+import json
+import math
+from collections import Counter
+
+import numpy as np
+
+from modules.sentiment_results import LABELS, SentimentResults
+
+class StreamingStat:
+    def __init__(self, low, high, bins=2000):
+        self.low = low
+        self.high = high
+        self.bins = bins
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.histogram = np.zeros(bins, dtype=np.int64)
+
+    def _bin(self, value):
+        index = int((value - self.low) / (self.high - self.low) * self.bins)
+        return min(max(index, 0), self.bins - 1)
+
+    def update(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        self.histogram[self._bin(value)] += 1
+
+    def update_array(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+
+        batch = StreamingStat(self.low, self.high, self.bins)
+        batch.count = len(values)
+        batch.mean = float(values.mean())
+        batch.m2 = float(((values - batch.mean) ** 2).sum())
+        batch.minimum = float(values.min())
+        batch.maximum = float(values.max())
+        indexes = ((values - self.low) / (self.high - self.low) * self.bins).astype(np.int64)
+        batch.histogram = np.bincount(np.clip(indexes, 0, self.bins - 1), minlength=self.bins)
+        self.merge(batch)
+
+    def merge(self, other):
+        if (other.low, other.high, other.bins) != (self.low, self.high, self.bins):
+            raise ValueError("Cannot merge statistics with different histogram layouts")
+        if other.count == 0:
+            return self
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.histogram += other.histogram
+        return self
+
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def quantile(self, q):
+        if self.count == 0:
+            return 0.0
+
+        target = q * self.count
+        cumulative = np.cumsum(self.histogram)
+        index = int(np.searchsorted(cumulative, target, side='left'))
+        index = min(index, self.bins - 1)
+
+        before = cumulative[index - 1] if index > 0 else 0
+        in_bin = self.histogram[index]
+        fraction = (target - before) / in_bin if in_bin else 0.0
+        width = (self.high - self.low) / self.bins
+        value = self.low + (index + fraction) * width
+        return float(min(max(value, self.minimum), self.maximum))
+
+    def to_dict(self):
+        nonzero = np.flatnonzero(self.histogram)
+        return {
+            'low': self.low,
+            'high': self.high,
+            'bins': self.bins,
+            'count': self.count,
+            'mean': self.mean,
+            'm2': self.m2,
+            'min': self.minimum if self.count else None,
+            'max': self.maximum if self.count else None,
+            'histogram': {str(i): int(self.histogram[i]) for i in nonzero}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stat = cls(data['low'], data['high'], data['bins'])
+        stat.count = data['count']
+        stat.mean = data['mean']
+        stat.m2 = data['m2']
+        stat.minimum = data['min'] if data['min'] is not None else math.inf
+        stat.maximum = data['max'] if data['max'] is not None else -math.inf
+        for index, count in data['histogram'].items():
+            stat.histogram[int(index)] = count
+        return stat
+
+class SentimentAccumulator:
+    QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+    def __init__(self, bins=2000):
+        self.label_counts = {label: 0 for label in LABELS}
+        self.score = StreamingStat(0.0, 1.0, bins)
+        self.compound = StreamingStat(-1.0, 1.0, bins)
+        self.skipped = {}
+
+    @property
+    def total_count(self):
+        return sum(self.label_counts.values())
+
+    @property
+    def skipped_count(self):
+        return sum(self.skipped.values())
+
+    def skip(self, language, count=1):
+        language = language or 'und'
+        self.skipped[language] = self.skipped.get(language, 0) + count
+        return self
+
+    def update(self, sentiment):
+        if sentiment.get('scored') is False:
+            return self.skip(sentiment.get('language'))
+
+        self.label_counts[sentiment['label']] += 1
+        self.score.update(sentiment['score'])
+        self.compound.update(sentiment['compound'])
+        return self
+
+    def update_many(self, sentiments):
+        if isinstance(sentiments, SentimentResults):
+            if sentiments.scored is not None and not sentiments.scored.all():
+                for language, count in Counter(sentiments.language[~sentiments.scored]).items():
+                    self.skip(language, count)
+                sentiments = sentiments.take(np.flatnonzero(sentiments.scored))
+
+            counts = np.bincount(sentiments.label_code, minlength=len(LABELS))
+            for code, label in enumerate(LABELS):
+                self.label_counts[label] += int(counts[code])
+            self.score.update_array(sentiments.score)
+            self.compound.update_array(sentiments.compound)
+            return self
+
+        for sentiment in sentiments:
+            self.update(sentiment)
+        return self
+
+    def merge(self, other):
+        for label, count in other.label_counts.items():
+            self.label_counts[label] = self.label_counts.get(label, 0) + count
+        self.score.merge(other.score)
+        self.compound.merge(other.compound)
+        for language, count in other.skipped.items():
+            self.skip(language, count)
+        return self
+
+    def __add__(self, other):
+        return SentimentAccumulator.from_dict(self.to_dict()).merge(other)
+
+    def summary(self):
+        total = self.total_count
+        skipped = {
+            'skipped_count': self.skipped_count,
+            'skipped_languages': dict(self.skipped)
+        }
+        if not total:
+            return skipped if self.skipped else {}
+
+        positive = self.label_counts['Positive']
+        negative = self.label_counts['Negative']
+        neutral = self.label_counts['Neutral']
+
+        return {
+            'total_count': total,
+            'positive_count': positive,
+            'negative_count': negative,
+            'neutral_count': neutral,
+            'average_score': self.score.mean,
+            'average_compound': self.compound.mean,
+            'sentiment_distribution': {
+                'positive_ratio': positive / total,
+                'negative_ratio': negative / total,
+                'neutral_ratio': neutral / total
+            },
+            'score_std': self.score.std,
+            'compound_std': self.compound.std,
+            'score_quantiles': {f"p{int(q * 100)}": self.score.quantile(q) for q in self.QUANTILES},
+            'compound_quantiles': {f"p{int(q * 100)}": self.compound.quantile(q) for q in self.QUANTILES},
+            **skipped
+        }
+
+    def to_dict(self):
+        return {
+            'label_counts': dict(self.label_counts),
+            'score': self.score.to_dict(),
+            'compound': self.compound.to_dict(),
+            'skipped': dict(self.skipped)
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        accumulator = cls()
+        accumulator.label_counts.update(data['label_counts'])
+        accumulator.score = StreamingStat.from_dict(data['score'])
+        accumulator.compound = StreamingStat.from_dict(data['compound'])
+        accumulator.skipped = dict(data.get('skipped', {}))
+        return accumulator
+
+    def to_json(self):
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, payload):
+        return cls.from_dict(json.loads(payload))
@@ -0,0 +1,89 @@
+import math
+import threading
+
+import numpy as np
+
+class StageProfiler:
+    QUANTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self, min_seconds=1e-7, max_seconds=100.0, bins_per_decade=20):
+        # log-spaced buckets keep the relative error of every percentile
+        # within half a bucket (~6% at 20 buckets per decade)
+        self.min_seconds = min_seconds
+        self.bins_per_decade = bins_per_decade
+        self._log_min = math.log10(min_seconds)
+        self.bins = int(math.ceil((math.log10(max_seconds) - self._log_min) * bins_per_decade)) + 1
+        # one profiler can be fed by several threads (Streamlit reruns, stream readers)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counts = {}
+            self.totals = {}
+            self.histograms = {}
+
+    def _bin(self, seconds):
+        if seconds <= self.min_seconds:
+            return 0
+        index = int((math.log10(seconds) - self._log_min) * self.bins_per_decade)
+        return min(index, self.bins - 1)
+
+    def _bin_seconds(self, index):
+        return 10 ** (self._log_min + (index + 0.5) / self.bins_per_decade)
+
+    def record(self, stage, seconds, count=1):
+        if count <= 0:
+            return
+
+        index = self._bin(seconds / count)
+        with self._lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = [0] * self.bins
+                self.counts[stage] = 0
+                self.totals[stage] = 0.0
+
+            # batched stages are recorded once with the per-item average
+            self.counts[stage] += count
+            self.totals[stage] += seconds
+            histogram[index] += count
+
+    def _copy_state(self):
+        with self._lock:
+            return (dict(self.counts), dict(self.totals),
+                    {stage: list(histogram) for stage, histogram in self.histograms.items()})
+
+    def merge(self, other):
+        counts, totals, histograms = other._copy_state()
+        with self._lock:
+            for stage, histogram in histograms.items():
+                if stage not in self.histograms:
+                    self.histograms[stage] = [0] * self.bins
+                    self.counts[stage] = 0
+                    self.totals[stage] = 0.0
+                self.counts[stage] += counts[stage]
+                self.totals[stage] += totals[stage]
+                self.histograms[stage] = [a + b for a, b in zip(self.histograms[stage], histogram)]
+        return self
+
+    def snapshot(self):
+        counts, totals, histograms = self._copy_state()
+        overall = sum(totals.values())
+        stages = {}
+        for stage, histogram in histograms.items():
+            count = counts[stage]
+            total = totals[stage]
+            cumulative = np.cumsum(histogram)
+
+            entry = {
+                'count': count,
+                'total_ms': total * 1000,
+                'mean_ms': total / count * 1000 if count else 0.0,
+                'share': total / overall if overall else 0.0
+            }
+            for q in self.QUANTILES:
+                index = min(int(np.searchsorted(cumulative, q * count, side='left')), self.bins - 1)
+                entry[f"p{int(q * 100)}_ms"] = self._bin_seconds(index) * 1000
+            stages[stage] = entry
+        return stages
@@ -0,0 +1,28 @@
+from collections import Counter
+import re
+
+# URLs, mentions and hashtags in one pattern. A mention stops where a URL would
+# begin, so "@user_http://..." cleans exactly as the old URL-then-mention passes did.
+_STRIP_PATTERN = re.compile(r'http\S+|www.\S+|[@#](?:(?!http\S|www.\S)\w)+')
+_TRIGGERS = ('@', '#', 'http', 'www')
+
+class TextNormalizer:
+    @staticmethod
+    def normalize(text):
+        for trigger in _TRIGGERS:
+            if trigger in text:
+                text = _STRIP_PATTERN.sub('', text)
+                break
+        return ' '.join(text.split())
+
+    @staticmethod
+    def normalize_batch(texts):
+        normalize = TextNormalizer.normalize
+        return [normalize(text) for text in texts]
+
+    @staticmethod
+    def word_frequencies(normalized_texts, top_n=20):
+        counts = Counter()
+        for text in normalized_texts:
+            counts.update(text.split())
+        return counts.most_common(top_n)
@@ -1,38 +1,57 @@
 import tweepy
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import time
 
+from modules.rate_limiter import RateLimitScheduler, RateLimitDeferred
+from modules.bloom_filter import RotatingBloomFilter
+
+class ScheduledClient(tweepy.Client):
+    def __init__(self, *args, scheduler=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scheduler = scheduler or RateLimitScheduler()
+    
+    def request(self, method, route, params=None, json=None, user_auth=False):
+        self.scheduler.acquire(route)
+        try:
+            response = super().request(method, route, params=params, json=json, user_auth=user_auth)
+        except tweepy.TooManyRequests as e:
+            self.scheduler.observe(route, e.response.headers, rate_limited=True)
+            raise
+        self.scheduler.observe(route, response.headers)
+        return response
+
 class TwitterAnalyzer:  
-    def __init__(self, bearer_token):
+    MAX_QUERY_LENGTH = 512
+    CONVERSATION_TWEET_FIELDS = ['created_at', 'author_id', 'public_metrics', 'conversation_id', 'in_reply_to_user_id', 'lang']
+    CONVERSATION_USER_FIELDS = ['created_at', 'description', 'public_metrics', 'verified']
+    
+    def __init__(self, bearer_token, scheduler=None):
         self.bearer_token = bearer_token
-        self.client = tweepy.Client(bearer_token=bearer_token)
+        self.client = ScheduledClient(bearer_token=bearer_token, scheduler=scheduler)
+        self.scheduler = self.client.scheduler
+        self.checkpoints = {}
+        self.interrupted = None
+        self.poll_state = {}
     
-    def get_tweets(self, query, limit=30, tweet_fields=None):
+    def get_tweets(self, query, limit=30, tweet_fields=None, resume=False):
+        return list(self.iter_tweets(query, limit, tweet_fields, resume))
+    
+    def iter_tweets(self, query, limit=30, tweet_fields=None, resume=False):
         try:
             if tweet_fields is None:
                 tweet_fields = ['created_at', 'author_id', 'public_metrics', 'context_annotations', 'lang']
             
-            tweets = tweepy.Paginator(
+            tweets = self._paginate(
+                ('search', query), resume, limit,
                 self.client.search_recent_tweets,
                 query=query,
                 tweet_fields=tweet_fields,
-                max_results=min(100, limit)
-            ).flatten(limit=limit)
+                max_results=max(10, min(100, limit))
+            )
             
-            tweet_list = []
             for tweet in tweets:
-                tweet_data = {
-                    'id': tweet.id,
-                    'text': tweet.text,
-                    'created_at': tweet.created_at,
-                    'author_id': tweet.author_id,
-                    'public_metrics': tweet.public_metrics,
-                    'lang': getattr(tweet, 'lang', 'unknown'),
-                    'context_annotations': getattr(tweet, 'context_annotations', [])
-                }
-                tweet_list.append(tweet_data)
-            
-            return tweet_list
+                yield self._search_tweet(tweet)
             
         except tweepy.TooManyRequests:
             raise Exception("Twitter API rate limit exceeded. Please wait before making more requests.")
@@ -41,7 +60,85 @@ class TwitterAnalyzer:
         except Exception as e:
             raise Exception(f"Error fetching tweets: {str(e)}")
     
-    def get_user_tweets(self, username, limit=30):
+    def poll_tweets(self, query, limit=100, tweet_fields=None):
+        try:
+            if tweet_fields is None:
+                tweet_fields = ['created_at', 'author_id', 'public_metrics', 'context_annotations', 'lang']
+            
+            state = self.poll_state.setdefault(query, {
+                'since_id': None,
+                'pending_newest': None,
+                'seen': RotatingBloomFilter(),
+                'polls': 0,
+                'fetched': 0,
+                'duplicates': 0
+            })
+            key = ('poll', query)
+            options = {'since_id': state['since_id']} if state['since_id'] else {}
+            
+            fresh = []
+            newest = state['pending_newest']
+            for tweet in self._paginate(
+                key, key in self.checkpoints, limit,
+                self.client.search_recent_tweets,
+                query=query,
+                tweet_fields=tweet_fields,
+                max_results=max(10, min(100, limit)),
+                **options
+            ):
+                newest = max(newest or tweet.id, tweet.id)
+                if not state['seen'].add_if_new(tweet.id):
+                    state['duplicates'] += 1
+                    continue
+                fresh.append(self._search_tweet(tweet))
+            
+            state['polls'] += 1
+            state['fetched'] += len(fresh)
+            
+            # since_id only moves once everything newer than it has been read;
+            # until then the next poll keeps paging the same window
+            if state['since_id'] is None:
+                self.checkpoints.pop(key, None)
+            if key not in self.checkpoints and not self.interrupted:
+                state['since_id'] = newest or state['since_id']
+                state['pending_newest'] = None
+            else:
+                state['pending_newest'] = newest
+            
+            return fresh
+            
+        except Exception as e:
+            raise Exception(f"Error polling tweets: {str(e)}")
+    
+    def get_poll_stats(self, query):
+        state = self.poll_state.get(query)
+        if state is None:
+            return {}
+        return {
+            'since_id': state['since_id'],
+            'catching_up': ('poll', query) in self.checkpoints,
+            'polls': state['polls'],
+            'fetched': state['fetched'],
+            'duplicates': state['duplicates'],
+            'seen_memory_bytes': state['seen'].memory_bytes
+        }
+    
+    @staticmethod
+    def _search_tweet(tweet):
+        return {
+            'id': tweet.id,
+            'text': tweet.text,
+            'created_at': tweet.created_at,
+            'author_id': tweet.author_id,
+            'public_metrics': tweet.public_metrics,
+            'lang': getattr(tweet, 'lang', 'unknown'),
+            'context_annotations': getattr(tweet, 'context_annotations', [])
+        }
+    
+    def get_user_tweets(self, username, limit=30, resume=False):
+        return list(self.iter_user_tweets(username, limit, resume))
+    
+    def iter_user_tweets(self, username, limit=30, resume=False):
         try:
             user = self.client.get_user(username=username)
             if not user.data:
@@ -49,16 +146,16 @@ class TwitterAnalyzer:
             
             user_id = user.data.id
             
-            tweets = tweepy.Paginator(
+            tweets = self._paginate(
+                ('user', username), resume, limit,
                 self.client.get_users_tweets,
                 id=user_id,
                 tweet_fields=['created_at', 'public_metrics', 'lang'],
-                max_results=min(100, limit)
-            ).flatten(limit=limit)
+                max_results=max(5, min(100, limit))
+            )
             
-            tweet_list = []
             for tweet in tweets:
-                tweet_data = {
+                yield {
                     'id': tweet.id,
                     'text': tweet.text,
                     'created_at': tweet.created_at,
@@ -67,13 +164,44 @@ class TwitterAnalyzer:
                     'public_metrics': tweet.public_metrics,
                     'lang': getattr(tweet, 'lang', 'unknown')
                 }
-                tweet_list.append(tweet_data)
-            
-            return tweet_list
             
         except Exception as e:
             raise Exception(f"Error fetching user tweets: {str(e)}")
     
+    def _paginate(self, key, resume, limit, method, **kwargs):
+        # the checkpoint names the page being read and how far into it we got,
+        # so a resumed pull neither repeats nor skips tweets
+        checkpoint = self.checkpoints.get(key) if resume else None
+        page_token = checkpoint['pagination_token'] if checkpoint else None
+        skip = checkpoint['offset'] if checkpoint else 0
+        self.interrupted = None
+        
+        count = 0
+        try:
+            for response in tweepy.Paginator(method, pagination_token=page_token, **kwargs):
+                page = response.data or []
+                for offset in range(skip, len(page)):
+                    if count >= limit:
+                        self.checkpoints[key] = {'pagination_token': page_token, 'offset': offset}
+                        return
+                    self.checkpoints[key] = {'pagination_token': page_token, 'offset': offset + 1}
+                    count += 1
+                    yield page[offset]
+                
+                skip = 0
+                page_token = (response.meta or {}).get('next_token')
+                if page_token is None:
+                    self.checkpoints.pop(key, None)
+                    return
+                self.checkpoints[key] = {'pagination_token': page_token, 'offset': 0}
+                if count >= limit:
+                    return
+        
+        except RateLimitDeferred as e:
+            self.interrupted = {'key': key, 'retry_at': e.retry_at, 'fetched': count}
+        except tweepy.TooManyRequests:
+            self.interrupted = {'key': key, 'retry_at': None, 'fetched': count}
+    
     def get_tweet_replies(self, tweet_id, limit=10):
         try:
             query = f"conversation_id:{tweet_id}"
@@ -103,6 +231,122 @@ class TwitterAnalyzer:
         except Exception as e:
             raise Exception(f"Error fetching tweet replies: {str(e)}")
     
+    def get_conversations(self, tweet_ids, limit_per_conversation=100, max_concurrency=4):
+        tweet_ids = list(dict.fromkeys(int(tweet_id) for tweet_id in tweet_ids))
+        authors = {}
+        
+        try:
+            tweets = self._lookup_tweets(tweet_ids, authors)
+            
+            replies = {tweet_id: [] for tweet_id in tweet_ids}
+            groups = self._conversation_queries(tweet_ids)
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                pages = executor.map(
+                    lambda group: self._search_conversations(group, limit_per_conversation),
+                    groups
+                )
+                for group_replies, group_authors in pages:
+                    authors.update(group_authors)
+                    for reply in group_replies:
+                        conversation = replies.get(reply['conversation_id'])
+                        if conversation is not None and len(conversation) < limit_per_conversation:
+                            conversation.append(reply)
+            
+            return {
+                'tweets': tweets,
+                'replies': replies,
+                'authors': authors
+            }
+            
+        except tweepy.TooManyRequests:
+            raise Exception("Twitter API rate limit exceeded. Please wait before making more requests.")
+        except Exception as e:
+            raise Exception(f"Error fetching conversations: {str(e)}")
+    
+    def _lookup_tweets(self, tweet_ids, authors):
+        tweets = {}
+        for offset in range(0, len(tweet_ids), 100):
+            response = self.client.get_tweets(
+                ids=tweet_ids[offset:offset + 100],
+                tweet_fields=self.CONVERSATION_TWEET_FIELDS,
+                expansions=['author_id'],
+                user_fields=self.CONVERSATION_USER_FIELDS
+            )
+            authors.update(self._users_from_includes(response.includes))
+            for tweet in response.data or []:
+                tweets[tweet.id] = self._conversation_tweet(tweet)
+        return tweets
+    
+    def _conversation_queries(self, tweet_ids):
+        # several conversations share one search as an OR query, up to the query length limit
+        groups = []
+        current = []
+        for tweet_id in tweet_ids:
+            candidate = current + [tweet_id]
+            if current and len(self._conversation_query(candidate)) > self.MAX_QUERY_LENGTH:
+                groups.append(current)
+                candidate = [tweet_id]
+            current = candidate
+        if current:
+            groups.append(current)
+        return groups
+    
+    @staticmethod
+    def _conversation_query(tweet_ids):
+        clauses = ' OR '.join(f"conversation_id:{tweet_id}" for tweet_id in tweet_ids)
+        return f"({clauses})" if len(tweet_ids) > 1 else clauses
+    
+    def _search_conversations(self, tweet_ids, limit_per_conversation):
+        replies = []
+        authors = {}
+        limit = limit_per_conversation * len(tweet_ids)
+        roots = set(tweet_ids)
+        
+        for response in tweepy.Paginator(
+            self.client.search_recent_tweets,
+            query=self._conversation_query(tweet_ids),
+            tweet_fields=self.CONVERSATION_TWEET_FIELDS,
+            expansions=['author_id'],
+            user_fields=self.CONVERSATION_USER_FIELDS,
+            max_results=max(10, min(100, limit))
+        ):
+            authors.update(self._users_from_includes(response.includes))
+            for tweet in response.data or []:
+                if tweet.id not in roots:
+                    replies.append(self._conversation_tweet(tweet))
+            if len(replies) >= limit:
+                break
+        
+        return replies, authors
+    
+    @staticmethod
+    def _conversation_tweet(tweet):
+        return {
+            'id': tweet.id,
+            'text': tweet.text,
+            'created_at': tweet.created_at,
+            'author_id': tweet.author_id,
+            'conversation_id': getattr(tweet, 'conversation_id', None),
+            'public_metrics': tweet.public_metrics,
+            'in_reply_to_user_id': getattr(tweet, 'in_reply_to_user_id', None),
+            'lang': getattr(tweet, 'lang', 'unknown')
+        }
+    
+    @staticmethod
+    def _users_from_includes(includes):
+        users = {}
+        for user in (includes or {}).get('users', []):
+            users[user.id] = {
+                'id': user.id,
+                'username': user.username,
+                'name': user.name,
+                'description': getattr(user, 'description', ''),
+                'created_at': getattr(user, 'created_at', None),
+                'verified': getattr(user, 'verified', False),
+                'public_metrics': getattr(user, 'public_metrics', {})
+            }
+        return users
+    
     def get_trending_topics(self, woeid=1):
         return ["Trending topics require API v1.1 access"]
     
@@ -0,0 +1,29 @@
+class TwitterMonitor:
+    def __init__(self, analyzer, sentiment_engine):
+        self.analyzer = analyzer
+        self.sentiment_engine = sentiment_engine
+        self.accumulators = {}
+    
+    def poll(self, query, limit=100):
+        tweets = self.analyzer.poll_tweets(query, limit)
+        results = self.sentiment_engine.batch_analyze(
+            [tweet['text'] for tweet in tweets],
+            columnar=True,
+            languages=[tweet['lang'] for tweet in tweets]
+        )
+        
+        accumulator = self.accumulators.get(query)
+        if accumulator is None:
+            accumulator = self.accumulators[query] = self.sentiment_engine.create_accumulator()
+        accumulator.update_many(results)
+        
+        return tweets, results
+    
+    def get_summary(self, query):
+        accumulator = self.accumulators.get(query)
+        if accumulator is None:
+            return {}
+        return {
+            **accumulator.summary(),
+            'polling': self.analyzer.get_poll_stats(query)
+        }
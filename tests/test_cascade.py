@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from modules.sentiment_engine import SentimentEngine
+
+REFERENCE_CORPUS = [
+    "I absolutely love this phone, the camera is amazing!",
+    "Worst customer service I have ever had. Never again.",
+    "The package arrived on Tuesday.",
+    "It's okay I guess, nothing special.",
+    "Not bad at all, actually pretty good.",
+    "This is not good.",
+    "GREAT game last night!!! :)",
+    "meh",
+    "I can't believe how terrible the update is, everything is broken",
+    "Thanks so much for the help, really appreciate it",
+    "The movie was long but the ending was beautiful.",
+    "Prices went up again this month.",
+    "Honestly the food was fine but the service was slow and rude",
+    "What a disaster of a launch lol",
+    "I'm not sure how I feel about the new design",
+    "Best purchase of the year, highly recommend",
+    "The meeting has been moved to 3pm.",
+    "so sad to hear the news today",
+    "Kind of disappointed, expected more from them",
+    "Wow. Just wow. Incredible work by the whole team!",
+    "The weather is cloudy with a chance of rain.",
+    "I hate waiting in line but the coffee was worth it",
+    "Could be better, could be worse.",
+    "This product broke after two days, total waste of money",
+    "Happy birthday! Hope you have a wonderful day",
+    "The report is due on Friday.",
+    "Not the worst, not the best",
+    "Absolutely furious about the delay",
+    "A decent effort with a few rough edges",
+    "",
+    "   ",
+    "Thrilled, delighted and grateful!",
+]
+
+@pytest.fixture
+def engines():
+    full = SentimentEngine(mode='full', cache_size=0)
+    cascade = SentimentEngine(mode='cascade', cache_size=0)
+    yield full, cascade
+    full.close()
+    cascade.close()
+
+def test_cascade_labels_match_full_mode(engines):
+    full, cascade = engines
+
+    expected = [result['label'] for result in full.batch_analyze(REFERENCE_CORPUS, parallel=False)]
+    actual = [result['label'] for result in cascade.batch_analyze(REFERENCE_CORPUS, parallel=False)]
+
+    assert actual == expected
+    stats = cascade.get_cascade_stats()
+    # the corpus must exercise both paths for the comparison to mean anything
+    assert stats['vader_only'] > 0
+    assert stats['textblob_fallback'] > 0
+
+def test_cascade_columnar_labels_match_full_mode(engines):
+    full, cascade = engines
+
+    expected = full.batch_analyze(REFERENCE_CORPUS, parallel=False, columnar=True)
+    actual = cascade.batch_analyze(REFERENCE_CORPUS, parallel=False, columnar=True)
+
+    assert list(actual.labels) == list(expected.labels)
+
+def test_cascade_compound_uses_full_mode_scale(engines):
+    full, cascade = engines
+
+    expected = full.batch_analyze(REFERENCE_CORPUS, parallel=False, columnar=True)
+    actual = cascade.batch_analyze(REFERENCE_CORPUS, parallel=False, columnar=True)
+
+    fallback = ~np.isnan(actual.textblob_polarity)
+    np.testing.assert_allclose(actual.compound[fallback], expected.compound[fallback])
+    # fast-path rows only drop the TextBlob term
+    skipped = ~fallback
+    difference = np.abs(actual.compound[skipped] - expected.compound[skipped])
+    assert np.all(difference <= full.textblob_weight + 1e-12)
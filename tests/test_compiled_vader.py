@@ -0,0 +1,18 @@
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from benchmarks.compiled_vader_benchmark import build_corpus
+from modules.compiled_vader import CompiledVader
+
+TOLERANCE = 1e-3
+
+def test_compiled_scores_match_stock_within_rounding():
+    analyzer = SentimentIntensityAnalyzer()
+    texts = build_corpus(2000) + ["", "   ", "NOT BAD AT ALL!!!", "meh :(", "kind of good, but never great"]
+
+    stock = [analyzer.polarity_scores(text) for text in texts]
+    compiled = CompiledVader(analyzer).polarity_scores_batch(texts)
+
+    assert len(compiled) == len(stock)
+    for text, expected, actual in zip(texts, stock, compiled):
+        for key in ('neg', 'neu', 'pos', 'compound'):
+            assert abs(expected[key] - actual[key]) <= TOLERANCE, (text, key)
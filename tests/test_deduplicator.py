@@ -0,0 +1,18 @@
+from modules.deduplicator import TextDeduplicator
+
+def test_case_variants_stay_separate_with_near_duplicates():
+    deduplicator = TextDeduplicator()
+
+    cluster_ids, representatives = deduplicator.cluster(["I LOVE it", "i love it", "I LOVE it"])
+
+    assert cluster_ids == [0, 1, 0]
+    assert representatives == [0, 1]
+
+def test_near_duplicates_still_merge():
+    deduplicator = TextDeduplicator(threshold=0.5)
+    base = "the new update is great and the camera works really well in low light"
+
+    cluster_ids, _ = deduplicator.cluster([base, base + " now"])
+
+    assert cluster_ids == [0, 0]
+    assert deduplicator.get_stats()['near_duplicates'] == 1
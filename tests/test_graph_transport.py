@@ -0,0 +1,145 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from modules.facebook_analyzer import FacebookAnalyzer
+from modules.graph_transport import GraphTransport, AsyncGraphTransport
+
+POSTS_PER_PAGE_ID = 7
+
+class _GraphHandler(BaseHTTPRequestHandler):
+    # keep-alive, so connection reuse by the shared Session is observable
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _record(self, query):
+        self.server.requests.append((self.command, urlsplit(self.path).path, query, self.client_address[1]))
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self._record(query)
+        parts = url.path.strip('/').split('/')
+
+        if parts[0] == 'slow':
+            with self.server.lock:
+                self.server.in_flight += 1
+                self.server.peak_in_flight = max(self.server.peak_in_flight, self.server.in_flight)
+            time.sleep(0.05)
+            with self.server.lock:
+                self.server.in_flight -= 1
+            self._reply({'id': parts[1]})
+            return
+
+        if len(parts) == 2 and parts[1] == 'posts':
+            page_id = parts[0]
+            offset = int(query.get('after', 0))
+            size = int(query.get('limit', 25))
+            end = min(offset + size, POSTS_PER_PAGE_ID)
+            payload = {'data': [
+                {'id': f"{page_id}_{i}", 'message': f"post {i}", 'created_time': '2024-01-01T00:00:00+0000'}
+                for i in range(offset, end)
+            ]}
+            if end < POSTS_PER_PAGE_ID:
+                # the next link carries the cursor, fields and token like the real API
+                payload['paging'] = {'next': (
+                    f"{self.server.url}/{page_id}/posts?after={end}&limit={size}"
+                    f"&fields={query.get('fields', '')}&access_token={query.get('access_token', '')}"
+                )}
+            self._reply(payload)
+            return
+
+        self._reply({'id': parts[0]})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        form = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode('utf-8')).items()}
+        self._record(form)
+        calls = json.loads(form['batch'])
+        self._reply([
+            {'code': 200, 'body': json.dumps({'relative_url': call['relative_url']})}
+            for call in calls
+        ])
+
+@pytest.fixture
+def graph_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _GraphHandler)
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    server.requests = []
+    server.lock = threading.Lock()
+    server.in_flight = 0
+    server.peak_in_flight = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+def test_transport_reuses_one_connection(graph_server):
+    transport = GraphTransport(graph_server.url, 'token')
+    try:
+        for i in range(5):
+            assert transport.get(f"node{i}") == {'id': f"node{i}"}
+    finally:
+        transport.close()
+
+    assert transport.request_count == 5
+    assert len({port for _, _, _, port in graph_server.requests}) == 1
+    assert all(query['access_token'] == 'token' for _, _, query, _ in graph_server.requests)
+
+def test_batch_packs_calls_into_one_post_per_fifty(graph_server):
+    transport = GraphTransport(graph_server.url, 'token')
+    urls = [f"post{i}/comments?limit=5" for i in range(120)]
+    try:
+        results = transport.batch(urls)
+    finally:
+        transport.close()
+
+    posts = [request for request in graph_server.requests if request[0] == 'POST']
+    assert len(posts) == 3
+    assert [len(json.loads(query['batch'])) for _, _, query, _ in posts] == [50, 50, 20]
+    assert results == [(200, {'relative_url': url}) for url in urls]
+
+def test_async_transport_caps_concurrency(graph_server):
+    transport = GraphTransport(graph_server.url, 'token', pool_size=3)
+    async_transport = AsyncGraphTransport(transport, max_concurrency=3)
+    try:
+        responses = asyncio.run(async_transport.get_many((f"slow/{i}", None) for i in range(12)))
+    finally:
+        async_transport.close()
+        transport.close()
+
+    assert responses == [{'id': str(i)} for i in range(12)]
+    assert graph_server.peak_in_flight == 3
+
+def test_fetch_posts_for_pages_follows_paging_up_to_limit(graph_server):
+    analyzer = FacebookAnalyzer('token', max_concurrency=2)
+    analyzer.PAGE_SIZE = 3
+    analyzer.transport.base_url = graph_server.url
+    try:
+        posts = analyzer.get_posts_for_pages(['a', 'b'], limit=5)
+    finally:
+        analyzer.close()
+
+    assert [post['id'] for post in posts['a']] == [f"a_{i}" for i in range(5)]
+    assert [post['id'] for post in posts['b']] == [f"b_{i}" for i in range(5)]
+    # two pages of three per page id, never one unbounded request
+    gets = [request for request in graph_server.requests if request[0] == 'GET']
+    assert len(gets) == 4
+    assert all(int(query['limit']) == 3 for _, _, query, _ in gets)
@@ -0,0 +1,94 @@
+import json
+
+import instaloader
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from modules.instagram_analyzer import InstagramAnalyzer
+from modules.rate_limiter import AdaptiveRateLimiter
+
+class _FakeInstagram(BaseAdapter):
+    def __init__(self, replies):
+        super().__init__()
+        self.replies = list(replies)
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request.url)
+        status, payload = self.replies.pop(0)
+        response = requests.Response()
+        response.status_code = status
+        response.reason = 'Too Many Requests' if status == 429 else 'OK'
+        response.headers['Content-Type'] = 'application/json'
+        response._content = json.dumps(payload).encode('utf-8')
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+def _page(ids, has_next):
+    return {'status': 'ok', 'data': {'user': {'edge_owner_to_timeline_media': {
+        'edges': [{'node': {'id': node_id}} for node_id in ids],
+        'page_info': {'has_next_page': has_next, 'end_cursor': 'cursor' if has_next else None}
+    }}}}
+
+@pytest.fixture
+def clock():
+    # sleeping advances the clock, so backoff windows pass without real waits
+    class Clock:
+        now = 1000.0
+        sleeps = []
+
+        def __call__(self):
+            return self.now
+
+        def sleep(self, seconds):
+            self.sleeps.append(seconds)
+            self.now += seconds
+    return Clock()
+
+def _analyzer(monkeypatch, clock, replies):
+    # graphql_query pages run on copied sessions, so the fake transport is installed for every session
+    transport = _FakeInstagram(replies)
+    monkeypatch.setattr(requests.Session, 'get_adapter', lambda session, url: transport)
+    limiter = AdaptiveRateLimiter(sleep=clock.sleep, clock=clock)
+    return InstagramAnalyzer(rate_limiter=limiter), limiter, transport
+
+def _timeline(analyzer):
+    return instaloader.NodeIterator(
+        analyzer.loader.context, 'timeline-hash',
+        lambda data: data['data']['user']['edge_owner_to_timeline_media'],
+        lambda node: node['id'],
+        {'id': '1'}
+    )
+
+def test_page_429_backs_off_exponentially(monkeypatch, clock):
+    analyzer, limiter, transport = _analyzer(monkeypatch, clock, [(429, {'status': 'fail'})] * 3)
+
+    with pytest.raises(instaloader.exceptions.ConnectionException):
+        _timeline(analyzer)
+
+    stats = limiter.get_stats()
+    assert len(transport.requests) == 3
+    assert stats['throttled'] == 2
+    assert stats['successes'] == 0
+    assert stats['rate_per_second'] < 0.5
+    # each consecutive 429 waits twice as long as the one before
+    assert clock.sleeps == pytest.approx([limiter.base_backoff, 2 * limiter.base_backoff])
+
+def test_completed_page_queries_ramp_the_rate_up(monkeypatch, clock):
+    replies = [(200, _page(['a', 'b'], True)), (429, {'status': 'fail'}), (200, _page(['c'], False))]
+    analyzer, limiter, transport = _analyzer(monkeypatch, clock, replies)
+
+    assert list(_timeline(analyzer)) == ['a', 'b', 'c']
+
+    stats = limiter.get_stats()
+    assert len(transport.requests) == 3
+    assert stats['throttled'] == 1
+    # one success per completed page query, not per attempt
+    assert stats['successes'] == 2
+    assert stats['throttle_streak'] == 0
+    assert stats['rate_per_second'] == pytest.approx((0.5 + limiter.increase) / 2 + limiter.increase)
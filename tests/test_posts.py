@@ -0,0 +1,39 @@
+import numpy as np
+
+from modules.sentiment_engine import SentimentEngine
+
+def test_short_posts_are_scored_on_the_joined_text():
+    engine = SentimentEngine(cache_size=0)
+    titles = ["Love it", "Terrible update", "Not sure", ""]
+    bodies = ["but the battery is awful and I hate it", "", "it is fine I guess", ""]
+
+    results = engine.analyze_posts(titles, bodies, columnar=True, parallel=False)
+    joined = engine.batch_analyze([title + " " + body for title, body in zip(titles, bodies)],
+                                  columnar=True, parallel=False)
+
+    assert list(results['post'].labels) == list(joined.labels)
+    np.testing.assert_allclose(results['post'].compound, joined.compound)
+
+def test_long_posts_fall_back_to_window_aggregate():
+    engine = SentimentEngine(cache_size=0, window_words=20)
+    body = "The service was slow. " * 10 + "But the food was great and we loved it."
+
+    results = engine.analyze_posts(["Dinner"], [body], columnar=True, parallel=False)
+
+    assert engine.get_document_stats()['windowed'] >= 2
+    expected = engine.analyze_documents(["Dinner " + body], columnar=True, parallel=False)
+    np.testing.assert_allclose(results['post'].compound, expected.compound)
+
+def test_empty_posts_are_not_counted_as_language_skips():
+    engine = SentimentEngine(cache_size=0)
+
+    results = engine.analyze_posts(["Great day for everyone here", "Ein wirklich schöner Tag für alle hier", ""],
+                                   ["", "Das ist wunderbar und toll", ""],
+                                   columnar=True, parallel=False, language_handler='skip')
+
+    assert list(results['post'].scored) == [True, False, True]
+    assert results['post'].labels[2] == 'Neutral'
+    stats = engine.get_language_stats()
+    assert stats['handler'] == 'skip'
+    assert stats['default_handler'] == 'score'
+    assert stats['handler_calls'] == {'skip': 1}
@@ -0,0 +1,44 @@
+from modules.rate_limiter import RateLimitScheduler
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+def _grant_times(scheduler, clock, requests):
+    times = []
+    for _ in range(requests):
+        scheduler.acquire('reddit')
+        times.append(clock.now)
+    return times
+
+def test_burst_keeps_every_window_within_the_limit():
+    clock = _Clock()
+    scheduler = RateLimitScheduler(default_limit=60, window=60, max_wait=None, burst=4,
+                                   sleep=clock.sleep, clock=clock)
+
+    times = _grant_times(scheduler, clock, 200)
+
+    # any 60 second span, including the first, admits at most 60 requests
+    for start in times:
+        assert sum(start <= t < start + 60 for t in times) <= 60
+    # and the budget is still used: the 60th request goes out as the first minute ends
+    assert times[59] <= 60 + 1e-6
+
+def test_idle_refill_is_capped_at_the_burst():
+    clock = _Clock()
+    scheduler = RateLimitScheduler(default_limit=60, window=60, max_wait=None, burst=4,
+                                   sleep=clock.sleep, clock=clock)
+    _grant_times(scheduler, clock, 10)
+
+    clock.now += 600
+    idle = clock.now
+    times = _grant_times(scheduler, clock, 60)
+
+    assert sum(t == idle for t in times) == 4
+    assert sum(t < idle + 60 for t in times) <= 60